@@ -34,6 +34,8 @@ def main():
     write(ROOT / "app/schemas/content.py", """
         from pydantic import BaseModel
         from typing import List, Optional, Any
+        from datetime import datetime
+        from .profiles import AuthorSummary
 
         class ContentCreate(BaseModel):
             type: str
@@ -47,6 +49,18 @@ def main():
             language: str = "tr"
             tags: Optional[List[str]] = None
 
+        class ContentSummary(BaseModel):
+            id: str
+            author_id: str
+            type: str
+            title: str
+            summary: Optional[str] = None
+            visibility: str
+            region: Optional[str] = None
+            language: str = "tr"
+            created_at: Optional[datetime] = None
+            author: Optional[AuthorSummary] = None  # ?expand=author
+
         class Content(BaseModel):
             id: str
             author_id: str
@@ -58,11 +72,15 @@ def main():
             visibility: str
             region: Optional[str] = None
             language: str = "tr"
+            created_at: Optional[datetime] = None
+            updated_at: Optional[datetime] = None
     """)
 
     write(ROOT / "app/schemas/qa.py", """
         from pydantic import BaseModel
         from typing import List, Optional, Any
+        from datetime import datetime
+        from .profiles import AuthorSummary
 
         class QuestionCreate(BaseModel):
             title: str
@@ -75,11 +93,53 @@ def main():
             body: str
             evidence: str = "n_a"
             sources: list[Any] = []
+
+        class Question(BaseModel):
+            id: str
+            asker_id: str
+            title: str
+            body: Optional[str] = None
+            tags: List[str] = []
+            created_at: Optional[datetime] = None
+            author: Optional[AuthorSummary] = None  # ?expand=author
+
+        class QuestionListItem(BaseModel):
+            # GET /qa/questions row: every key is present by default, only the requested ones with ?fields=
+            id: Optional[str] = None
+            asker_id: Optional[str] = None
+            title: Optional[str] = None
+            body: Optional[str] = None
+            snippet: Optional[str] = None  # first LIST_SNIPPET_CHARS characters of body
+            tags: Optional[List[str]] = None
+            created_at: Optional[datetime] = None
+            author: Optional[AuthorSummary] = None  # ?expand=author
+
+        class Answer(BaseModel):
+            id: str
+            question_id: str
+            author_id: str
+            body: str
+            is_accepted: bool = False
+            created_at: Optional[datetime] = None
+
+        class ThreadMetrics(BaseModel):
+            answer_count: int = 0
+            last_answer_at: Optional[datetime] = None
+            has_accepted: bool = False
+
+        class QuestionThread(BaseModel):
+            question: Question
+            accepted_answer: Optional[Answer] = None  # pinned; never repeated in answers
+            answers: List[Answer] = []
+            next_cursor: Optional[str] = None  # pass as ?after= for the next page
+            metrics: ThreadMetrics
     """)
 
     write(ROOT / "app/schemas/projects.py", """
         from pydantic import BaseModel
         from typing import List, Optional
+        from datetime import datetime
+        from .profiles import AuthorSummary, ProfileCard
 
         class ProjectCreate(BaseModel):
             title: str
@@ -91,12 +151,36 @@ def main():
 
         class ProjectApply(BaseModel):
             message: Optional[str] = None
+
+        class Project(BaseModel):
+            id: str
+            owner_id: str
+            title: str
+            description: Optional[str] = None
+            needed_roles: List[str] = []
+            tags: List[str] = []
+            created_at: Optional[datetime] = None
+            author: Optional[AuthorSummary] = None  # ?expand=author (owner)
+
+        class Application(BaseModel):
+            id: str
+            applicant_id: str
+            message: Optional[str] = None
+            status: str  # pending/proposed/accepted/rejected
+            proposed_role: Optional[str] = None  # set by POST /projects/assignments
+            created_at: Optional[datetime] = None
+
+        class Candidate(BaseModel):
+            profile: ProfileCard
+            score: float
+            matched_roles: List[str] = []  # needed_roles the profile offers
     """)
 
     write(ROOT / "app/schemas/events.py", """
         from pydantic import BaseModel
         from typing import List, Optional
-        from datetime import datetime
+        from datetime import date, datetime
+        from .profiles import AuthorSummary
 
         class EventCreate(BaseModel):
             title: str
@@ -108,16 +192,66 @@ def main():
             capacity: Optional[int] = None
             tags: List[str] = []
             visibility: str = "public"
+
+        class Event(BaseModel):
+            id: str
+            host_id: str
+            title: str
+            type: str
+            starts_at: datetime
+            ends_at: Optional[datetime] = None
+            location: Optional[str] = None
+            capacity: Optional[int] = None
+            enrolled_count: int = 0  # 'going' enrollments
+            tags: List[str] = []
+            created_at: Optional[datetime] = None
+            author: Optional[AuthorSummary] = None  # ?expand=author (host)
+
+        class EventDay(BaseModel):
+            date: date  # in the requested tz
+            events: List[Event]
     """)
 
-    write(ROOT / "app/schemas/reports.py", """
+    write(ROOT / "app/schemas/notifications.py", """
         from pydantic import BaseModel
+        from typing import Any, Optional
+        from datetime import datetime
+
+        class Notification(BaseModel):
+            id: str
+            type: str
+            payload: dict[str, Any]
+            read_at: Optional[datetime] = None
+            created_at: Optional[datetime] = None
+    """)
+
+    write(ROOT / "app/schemas/reports.py", """
+        from pydantic import BaseModel, Field
+        from typing import Literal, Optional
+        from datetime import datetime
+
+        # values of the entity_kind enum
+        EntityKind = Literal["content", "question", "answer", "project", "rfh", "event", "discussion_topic", "forum_post"]
 
         class ReportCreate(BaseModel):
-            entity: str
+            entity: EntityKind
             entity_id: str
             reason: str | None = None
-            severity: int = 1
+            severity: int = Field(1, ge=1, le=5)
+
+        class QueueItem(BaseModel):
+            entity: str
+            entity_id: str
+            open_count: int
+            total_count: int
+            max_severity: int
+            priority: int
+            first_reported_at: Optional[datetime] = None
+            last_reported_at: Optional[datetime] = None
+            hidden_at: Optional[datetime] = None  # set while auto-hidden or hidden by a moderator
+
+        class QueueDecision(BaseModel):
+            action: Literal["dismiss", "hide"]  # both close the entity's open reports
     """)
 
     # =========================
@@ -129,14 +263,18 @@ def main():
         from sqlalchemy import text
         from sqlalchemy.ext.asyncio import AsyncSession
         from typing import Optional
-        from ...api.deps import get_db, require_user_id
-        from ...schemas.content import ContentCreate
-        from ...utils.dbhelpers import row_to_dict
+        from ...api.deps import expansions, get_db, require_user_id
+        from ...middleware.idempotency import Idempotency, idempotency
+        from ...middleware.ratelimit import rate_limit
+        from ...schemas.content import ContentCreate, ContentSummary
+        from ...utils.dbhelpers import row_to_dict, rows_response, rows_with_authors_response
+        from ...utils import tags as tag_cache
 
         router = APIRouter()
 
-        @router.post("", response_model=dict)
-        async def create_content(payload: ContentCreate, db: AsyncSession = Depends(get_db), user_id: str = Depends(require_user_id)):
+        @router.post("", response_model=dict, dependencies=[Depends(rate_limit("write"))])
+        async def create_content(payload: ContentCreate, db: AsyncSession = Depends(get_db), user_id: str = Depends(require_user_id),
+                                 idem: Idempotency = Depends(idempotency("content"))):
             csql = text(\"\"\"
                 insert into public.content (author_id, type, title, summary, body, evidence, visibility, sources, region, language)
                 values (:uid, :type, :title, :summary, :body, :evidence, :visibility, coalesce(:sources,'[]'::jsonb), :region, :language)
@@ -151,14 +289,16 @@ def main():
             r = await db.execute(csql, params)
             cid = r.scalar()
 
-            if payload.tags:
+            new_tags = tag_cache.missing(payload.tags or [])
+            if new_tags:
                 # ensure tags exist; insert missing
                 await db.execute(text(\"\"\"
                     insert into public.tags (slug, label)
                     select t, initcap(replace(t,'-',' '))
                     from unnest(:tags) as t
                     on conflict do nothing
-                \"\"\"), {"tags": payload.tags})
+                \"\"\"), {"tags": new_tags})
+            if payload.tags:
                 await db.execute(text(\"\"\"
                     insert into public.content_tags (content_id, tag_id)
                     select :cid, tg.id
@@ -166,18 +306,22 @@ def main():
                     where tg.slug = any(:tags)
                 \"\"\"), {"cid": cid, "tags": payload.tags})
 
+            result = {"id": str(cid)}
+            await idem.store(db, result)
             await db.commit()
-            return {"id": str(cid)}
+            tag_cache.remember(new_tags)
+            return result
 
-        @router.get("", response_model=list[dict])
-        async def list_content(q: Optional[str] = None, tag: Optional[str] = None, db: AsyncSession = Depends(get_db)):
-            base = \"""
+        @router.get("", response_model=list[ContentSummary])
+        async def list_content(q: Optional[str] = None, tag: Optional[str] = None, expand: set[str] = Depends(expansions("author")),
+                               db: AsyncSession = Depends(get_db)):
+            base = \"\"\"
                 select c.id, c.author_id, c.type, c.title, c.summary, c.visibility, c.region, c.language, c.created_at
                 from public.content c
                 left join public.content_tags ct on ct.content_id = c.id
                 left join public.tags tg on tg.id = ct.tag_id
                 where c.is_published = true and (c.visibility = 'public')
-            \"
+            \"\"\"
             args = {}
             if q:
                 base += " and (c.title ilike :q or c.summary ilike :q or c.body ilike :q)"
@@ -187,7 +331,9 @@ def main():
                 args["tag"] = tag
             base += " group by c.id order by c.created_at desc limit 50"
             res = await db.execute(text(base), args)
-            return [row_to_dict(r) for r in res.fetchall()]
+            if "author" in expand:
+                return await rows_with_authors_response(db, res, "author_id")
+            return rows_response(res)
 
         @router.get("/{content_id}", response_model=dict)
         async def get_content(content_id: str, db: AsyncSession = Depends(get_db)):
@@ -203,17 +349,72 @@ def main():
 
     # Q&A
     write(ROOT / "app/api/v1/routes_qa.py", """
-        from fastapi import APIRouter, Depends
+        import uuid
+        from fastapi import APIRouter, Depends, HTTPException, Query
+        from fastapi.responses import Response
         from sqlalchemy import text
         from sqlalchemy.ext.asyncio import AsyncSession
         from typing import Optional
-        from ...api.deps import get_db, require_user_id
-        from ...schemas.qa import QuestionCreate, AnswerCreate
-        from ...utils.dbhelpers import row_to_dict
+        from ...api.deps import Fieldset, expansions, get_db, require_user_id, sparse_fields
+        from ...match.dedup import dedup_index
+        from ...middleware.auth import get_current_user_id
+        from ...middleware.idempotency import Idempotency, idempotency
+        from ...middleware.ratelimit import rate_limit
+        from ...schemas.qa import QuestionCreate, AnswerCreate, QuestionListItem, Answer, QuestionThread
+        from ...utils.dbhelpers import list_response, snippet_sql
 
         router = APIRouter()
 
-        @router.post("/questions", response_model=dict)
+        QUESTION_COLUMNS = ("id", "asker_id", "title", "body", "tags", "created_at")
+        QUESTION_FIELDS = {c: c for c in QUESTION_COLUMNS} | {"snippet": snippet_sql("body")}
+        QUESTION_FIELD_SOURCES = {"snippet": "body"}
+        PUBLIC_QUESTIONS = " from public.questions where (visibility='public')"
+        QUESTIONS_SQL = f"select {', '.join(QUESTION_COLUMNS)}{PUBLIC_QUESTIONS}"
+        ANSWERS_SQL = "select id, question_id, author_id, body, is_accepted, created_at from public.answers where question_id=:qid"
+
+        # One statement, rendered by Postgres: the question, its accepted answer, one keyset
+        # page of the other answers (:n + 1 rows fetched to know whether a next page exists)
+        # and the counters kept on questions by trg_answers_counts.
+        THREAD_SQL = \"\"\"
+            with q as (
+                select id, asker_id, title, body, tags, created_at, accepted_answer_id, answer_count, last_answer_at
+                from public.questions
+                where id = :qid and (visibility = 'public' or asker_id = cast(:uid as uuid))
+            ),
+            acc as (
+                select a.id, a.question_id, a.author_id, a.body, a.is_accepted, a.created_at
+                from public.answers a join q on a.id = q.accepted_answer_id
+            ),
+            page as (
+                select a.id, a.question_id, a.author_id, a.body, a.is_accepted, a.created_at,
+                       row_number() over (order by a.created_at, a.id) as rn
+                from (
+                    select * from public.answers a
+                    where a.question_id = :qid
+                      and a.id is distinct from (select accepted_answer_id from q)
+                      and (cast(:after as uuid) is null
+                           or (a.created_at, a.id) > (select created_at, id from public.answers
+                                                      where id = cast(:after as uuid) and question_id = :qid))
+                    order by a.created_at, a.id
+                    limit :n + 1
+                ) a
+            )
+            select case when exists (select 1 from q) then json_build_object(
+                'question', (select json_build_object('id', id, 'asker_id', asker_id, 'title', title, 'body', body,
+                                                      'tags', tags, 'created_at', created_at) from q),
+                'accepted_answer', (select row_to_json(acc) from acc),
+                'answers', coalesce((select json_agg(json_build_object('id', id, 'question_id', question_id,
+                                                                       'author_id', author_id, 'body', body,
+                                                                       'is_accepted', is_accepted, 'created_at', created_at)
+                                                     order by rn)
+                                     from page where rn <= :n), '[]'::json),
+                'next_cursor', (select id from page where rn = :n and exists (select 1 from page where rn > :n)),
+                'metrics', (select json_build_object('answer_count', answer_count, 'last_answer_at', last_answer_at,
+                                                     'has_accepted', accepted_answer_id is not null) from q)
+            )::text end
+        \"\"\"
+
+        @router.post("/questions", response_model=dict, dependencies=[Depends(rate_limit("write"))])
         async def create_question(payload: QuestionCreate, db: AsyncSession = Depends(get_db), user_id: str = Depends(require_user_id)):
             r = await db.execute(text(\"\"\"
                 insert into public.questions (asker_id, title, body, tags, visibility)
@@ -222,11 +423,17 @@ def main():
             \"\"\"), {"uid": user_id, "title": payload.title, "body": payload.body, "tags": payload.tags, "visibility": payload.visibility})
             qid = r.scalar()
             await db.commit()
-            return {"id": str(qid)}
+            duplicates = dedup_index.similar(payload.title, payload.body)
+            if payload.visibility == "public":
+                dedup_index.add(str(qid), "question", payload.title, payload.body)
+            return {"id": str(qid), "duplicates": duplicates}
 
-        @router.get("/questions", response_model=list[dict])
-        async def list_questions(q: Optional[str] = None, tag: Optional[str] = None, db: AsyncSession = Depends(get_db)):
-            base = "select id, asker_id, title, body, tags, created_at from public.questions where (visibility='public')"
+        @router.get("/questions", response_model=list[QuestionListItem])
+        async def list_questions(q: Optional[str] = None, tag: Optional[str] = None, expand: set[str] = Depends(expansions("author")),
+                                 fields: Fieldset = Depends(sparse_fields(QUESTION_FIELDS, QUESTION_COLUMNS, QUESTION_FIELD_SOURCES)),
+                                 db: AsyncSession = Depends(get_db)):
+            needed = ("asker_id",) if "author" in expand else ()
+            base = f"select {fields.columns(*needed, 'created_at')}{PUBLIC_QUESTIONS}"
             args = {}
             if q:
                 base += " and (title ilike :q or body ilike :q)"
@@ -235,34 +442,58 @@ def main():
                 base += " and :t = any(tags)"
                 args["t"] = tag
             base += " order by created_at desc limit 50"
-            res = await db.execute(text(base), args)
-            return [row_to_dict(r) for r in res.fetchall()]
+            base = f"select {fields.select(*needed)} from ({base}) q order by created_at desc"
+            author_key = "asker_id" if "author" in expand else None
+            # without created_at in the output, json_agg keeps the order of the sorted subquery
+            order_by = "created_at desc" if "created_at" in fields else None
+            return await list_response(db, base, args, order_by=order_by, author_key=author_key, hidden=fields.hidden(*needed))
 
-        @router.post("/answers", response_model=dict)
-        async def create_answer(payload: AnswerCreate, db: AsyncSession = Depends(get_db), user_id: str = Depends(require_user_id)):
+        @router.post("/answers", response_model=dict, dependencies=[Depends(rate_limit("write"))])
+        async def create_answer(payload: AnswerCreate, db: AsyncSession = Depends(get_db), user_id: str = Depends(require_user_id),
+                                idem: Idempotency = Depends(idempotency("answer"))):
             r = await db.execute(text(\"\"\"
                 insert into public.answers (question_id, author_id, body, evidence, sources)
                 values (:qid, :uid, :body, :evidence, :sources)
                 returning id
             \"\"\"), {"qid": payload.question_id, "uid": user_id, "body": payload.body, "evidence": payload.evidence, "sources": payload.sources})
             aid = r.scalar()
+            result = {"id": str(aid)}
+            await idem.store(db, result)
             await db.commit()
-            return {"id": str(aid)}
+            return result
 
-        @router.get("/questions/{qid}/answers", response_model=list[dict])
+        @router.get("/questions/{qid}/thread", response_model=QuestionThread)
+        async def question_thread(qid: str, after: Optional[str] = None, limit: int = Query(20, ge=1, le=100),
+                                  db: AsyncSession = Depends(get_db), user_id: Optional[str] = Depends(get_current_user_id)):
+            try:
+                uuid.UUID(qid)
+                if after:
+                    uuid.UUID(after)
+            except ValueError:
+                raise HTTPException(422, "qid and after must be UUIDs")
+            body = (await db.execute(text(THREAD_SQL), {"qid": qid, "after": after, "n": limit, "uid": user_id})).scalar()
+            if body is None:
+                raise HTTPException(404, "Question not found")
+            return Response(body.encode(), media_type="application/json")
+
+        @router.get("/questions/{qid}/answers", response_model=list[Answer])
         async def list_answers(qid: str, db: AsyncSession = Depends(get_db)):
-            res = await db.execute(text("select id, question_id, author_id, body, is_accepted, created_at from public.answers where question_id=:qid order by created_at asc"), {"qid": qid})
-            return [row_to_dict(r) for r in res.fetchall()]
+            return await list_response(db, ANSWERS_SQL + " order by created_at asc", {"qid": qid}, order_by="created_at asc")
     """)
 
     # Projects
     write(ROOT / "app/api/v1/routes_projects.py", """
-        from fastapi import APIRouter, Depends
+        import uuid
+        from fastapi import APIRouter, Depends, HTTPException, Query
+        from fastapi.responses import Response
         from sqlalchemy import text
         from sqlalchemy.ext.asyncio import AsyncSession
-        from ...api.deps import get_db, require_user_id
-        from ...schemas.projects import ProjectCreate, ProjectApply
-        from ...utils.dbhelpers import row_to_dict
+        from ...api.deps import Viewer, expansions, get_db, get_viewer, require_user_id
+        from ...match import teams
+        from ...match.candidates import candidate_index
+        from ...schemas.projects import Application, Candidate, ProjectCreate, ProjectApply, Project
+        from ...utils.dbhelpers import dumps, rows_response, rows_with_authors_response
+        from ...utils.profile_cards import get_cards
 
         router = APIRouter()
 
@@ -278,10 +509,12 @@ def main():
             await db.commit()
             return {"id": str(pid)}
 
-        @router.get("", response_model=list[dict])
-        async def list_projects(db: AsyncSession = Depends(get_db)):
+        @router.get("", response_model=list[Project])
+        async def list_projects(expand: set[str] = Depends(expansions("author")), db: AsyncSession = Depends(get_db)):
             res = await db.execute(text("select id, owner_id, title, description, needed_roles, tags, created_at from public.projects order by created_at desc limit 50"))
-            return [row_to_dict(r) for r in res.fetchall()]
+            if "author" in expand:
+                return await rows_with_authors_response(db, res, "owner_id")
+            return rows_response(res)
 
         @router.post("/{project_id}/apply", response_model=dict)
         async def apply_project(project_id: str, payload: ProjectApply, db: AsyncSession = Depends(get_db), user_id: str = Depends(require_user_id)):
@@ -292,19 +525,237 @@ def main():
             aid = r.scalar()
             await db.commit()
             return {"application_id": str(aid)}
+
+        @router.get("/{project_id}/candidates", response_model=list[Candidate])
+        async def project_candidates(project_id: str, limit: int = Query(20, ge=1, le=100), db: AsyncSession = Depends(get_db)):
+            try:
+                project_id = str(uuid.UUID(project_id))
+            except ValueError:
+                raise HTTPException(404, "project not found")
+            project = (await db.execute(text(\"\"\"
+                select p.needed_roles, p.tags, p.region,
+                       array(select m.user_id::text from public.project_members m where m.project_id = p.id) as members
+                from public.projects p where p.id = :pid
+            \"\"\"), {"pid": project_id})).first()
+            if project is None:
+                raise HTTPException(404, "project not found")
+            # a few extra in case some ranked profiles were deleted since they were indexed
+            ranked = candidate_index.rank(project.needed_roles, project.tags, project.region, limit + 10, exclude=project.members)
+            cards = await get_cards(db, [c["id"] for c in ranked])
+            out = [{"profile": cards[c.pop("id")], **c} for c in ranked if c["id"] in cards]
+            return Response(dumps(out[:limit]), media_type="application/json")
+
+        @router.post("/assignments", response_model=dict)
+        async def propose_assignments(viewer: Viewer = Depends(get_viewer), db: AsyncSession = Depends(get_db)):
+            # admin-triggered, e.g. after a cohort of volunteers has applied
+            if not viewer.is_admin:
+                raise HTTPException(403, "admins only")
+            return await teams.propose(db)
+
+        @router.get("/{project_id}/applications", response_model=list[Application])
+        async def list_applications(project_id: str, db: AsyncSession = Depends(get_db), user_id: str = Depends(require_user_id)):
+            res = await db.execute(text(\"\"\"
+                select a.id, a.applicant_id, a.message, a.status, a.proposed_role, a.created_at
+                from public.project_applications a join public.projects p on p.id = a.project_id
+                where a.project_id = :pid and p.owner_id = :uid
+                order by (a.status = 'proposed') desc, a.created_at
+            \"\"\"), {"pid": project_id, "uid": user_id})
+            return rows_response(res)
+
+        @router.post("/{project_id}/applications/{application_id}/approve", response_model=dict)
+        async def approve_application(project_id: str, application_id: str, db: AsyncSession = Depends(get_db), user_id: str = Depends(require_user_id)):
+            # the applicant joins in the proposed role (or as a plain member)
+            r = await db.execute(text(\"\"\"
+                with app as (
+                    update public.project_applications a set status = 'accepted'
+                    from public.projects p
+                    where a.id = :aid and a.project_id = :pid and p.id = a.project_id and p.owner_id = :uid
+                      and a.status in ('pending', 'proposed')
+                    returning a.applicant_id, coalesce(a.proposed_role, 'member') as role
+                )
+                insert into public.project_members (project_id, user_id, role)
+                select :pid, applicant_id, role from app
+                on conflict (project_id, user_id) do update set role = excluded.role
+                returning role
+            \"\"\"), {"aid": application_id, "pid": project_id, "uid": user_id})
+            role = r.scalar()
+            if role is None:
+                raise HTTPException(404, "no open application")
+            await db.commit()
+            return {"accepted": True, "role": role}
+
+        @router.post("/{project_id}/applications/{application_id}/reject", response_model=dict)
+        async def reject_application(project_id: str, application_id: str, db: AsyncSession = Depends(get_db), user_id: str = Depends(require_user_id)):
+            r = await db.execute(text(\"\"\"
+                update public.project_applications a set status = 'rejected'
+                from public.projects p
+                where a.id = :aid and a.project_id = :pid and p.id = a.project_id and p.owner_id = :uid
+                  and a.status in ('pending', 'proposed')
+                returning a.id
+            \"\"\"), {"aid": application_id, "pid": project_id, "uid": user_id})
+            if r.scalar() is None:
+                raise HTTPException(404, "no open application")
+            await db.commit()
+            return {"rejected": True}
+    """)
+
+    write(ROOT / "app/match/teams.py", """
+        # Global assignment of open project applications to unfilled needed_roles.
+        #
+        # Applicants and role slots (one per needed_role not yet held by a member) form a
+        # bipartite graph with an edge wherever the applicant applied to the slot's project.
+        # A maximum-weight matching picks at most one slot per applicant and one applicant
+        # per slot; the result is written as 'proposed' applications for owners to approve.
+        import asyncio
+        import time
+        from dataclasses import dataclass, field
+
+        from sqlalchemy import text
+        from .candidates import norm
+
+        try:
+            import numpy as np
+            from scipy import sparse
+            from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+        except ImportError:  # optional: without scipy a greedy pass is used instead
+            np = sparse = None
+
+        # weight = APPLIED + ROLE if the applicant offers the role + TAG * share of project
+        # tags offered + REGION if same region; every edge is worth more than no assignment
+        W_APPLIED, W_ROLE, W_TAG, W_REGION = 1.0, 4.0, 2.0, 1.0
+
+        OPEN_APPLICATIONS_SQL = \"\"\"
+            select a.id, a.applicant_id, a.project_id, p.needed_roles, p.tags, p.region,
+                   pr.roles::text[] as roles, pr.offers, pr.region as applicant_region
+            from public.project_applications a
+            join public.projects p on p.id = a.project_id
+            join public.profiles pr on pr.id = a.applicant_id
+            where a.status in ('pending', 'proposed')
+        \"\"\"
+        MEMBERS_SQL = "select project_id, user_id, role from public.project_members where project_id = any(:pids)"
+
+        @dataclass
+        class Graph:
+            applicants: list = field(default_factory=list)  # applicant ids, row index
+            slots: list = field(default_factory=list)       # (project id, needed role), column index
+            edges: dict = field(default_factory=dict)       # (row, col) -> (weight, application id)
+
+        def edge_weight(role: str, app, terms: frozenset) -> float:
+            # app is an OPEN_APPLICATIONS_SQL row: project fields plus the applicant's
+            tags = {norm(t) for t in app.tags or ()}
+            w = W_APPLIED + (W_ROLE if norm(role) in terms else 0.0)
+            w += W_TAG * len(tags & terms) / len(tags) if tags else 0.0
+            if app.region and app.applicant_region and app.region.casefold() == app.applicant_region.casefold():
+                w += W_REGION
+            return w
+
+        def build(applications, members) -> Graph:
+            held: dict = {}   # project id -> roles already filled
+            joined = set()    # (project id, user id)
+            for m in members:
+                held.setdefault(m.project_id, []).append(norm(m.role or ""))
+                joined.add((m.project_id, m.user_id))
+            g = Graph()
+            rows: dict = {}
+            cols: dict = {}   # project id -> column indexes of its open slots
+            for a in applications:
+                if (a.project_id, a.applicant_id) in joined:
+                    continue
+                if a.project_id not in cols:
+                    free = list(held.get(a.project_id, ()))
+                    cols[a.project_id] = []
+                    for role in a.needed_roles or ():
+                        if norm(role) in free:
+                            free.remove(norm(role))  # one member fills one slot of a repeated role
+                            continue
+                        cols[a.project_id].append(len(g.slots))
+                        g.slots.append((a.project_id, role))
+                row = rows.setdefault(a.applicant_id, len(rows))
+                if row == len(g.applicants):
+                    g.applicants.append(a.applicant_id)
+                terms = frozenset(norm(t) for t in (*(a.roles or ()), *(a.offers or ())))
+                for col in cols[a.project_id]:
+                    w = edge_weight(g.slots[col][1], a, terms)
+                    if w > g.edges.get((row, col), (0.0,))[0]:
+                        g.edges[(row, col)] = (w, a.id)
+            return g
+
+        def solve(n_rows: int, n_cols: int, edges: dict) -> list[tuple[int, int]]:
+            \"\"\"Maximum-weight matching on a sparse bipartite graph; returns (row, col) pairs.\"\"\"
+            if not edges:
+                return []
+            if sparse is None:
+                return greedy(edges)
+            keys = np.array(list(edges), dtype=np.int64).reshape(-1, 2)
+            w = np.fromiter((v[0] for v in edges.values()), dtype=float, count=len(edges))
+            top = w.max() + 1.0
+            # each row also gets a private "unassigned" column so a full row matching always
+            # exists; with every row matched, min sum(top - w) == max sum(w)
+            dummy = np.arange(n_rows)
+            r = np.concatenate([keys[:, 0], dummy])
+            c = np.concatenate([keys[:, 1], n_cols + dummy])
+            cost = np.concatenate([top - w, np.full(n_rows, top)])
+            m = sparse.csr_matrix((cost, (r, c)), shape=(n_rows, n_cols + n_rows))
+            row_ind, col_ind = min_weight_full_bipartite_matching(m)
+            return [(int(i), int(j)) for i, j in zip(row_ind, col_ind) if j < n_cols]
+
+        def greedy(edges: dict) -> list[tuple[int, int]]:
+            used_rows, used_cols, out = set(), set(), []
+            for (i, j), _ in sorted(edges.items(), key=lambda kv: -kv[1][0]):
+                if i not in used_rows and j not in used_cols:
+                    used_rows.add(i)
+                    used_cols.add(j)
+                    out.append((i, j))
+            return out
+
+        async def propose(db) -> dict:
+            \"\"\"Re-plan every open application and store the result; commits.\"\"\"
+            apps = (await db.execute(text(OPEN_APPLICATIONS_SQL))).all()
+            pids = list({a.project_id for a in apps})
+            members = (await db.execute(text(MEMBERS_SQL), {"pids": pids})).all() if pids else []
+            t0 = time.perf_counter()
+            g = await asyncio.to_thread(build, apps, members)
+            pairs = await asyncio.to_thread(solve, len(g.applicants), len(g.slots), g.edges)
+            solve_ms = (time.perf_counter() - t0) * 1000
+            ids = [g.edges[p][1] for p in pairs]
+            roles = [g.slots[j][1] for _, j in pairs]
+            await db.execute(text("update public.project_applications set status = 'pending', proposed_role = null where status = 'proposed'"))
+            if ids:
+                await db.execute(text(\"\"\"
+                    update public.project_applications a set status = 'proposed', proposed_role = v.role
+                    from unnest(cast(:ids as uuid[]), cast(:roles as text[])) as v(id, role)
+                    where a.id = v.id and a.status = 'pending'
+                \"\"\"), {"ids": ids, "roles": roles})
+            await db.commit()
+            return {
+                "applicants": len(g.applicants), "slots": len(g.slots), "edges": len(g.edges),
+                "proposed": len(pairs), "total_weight": round(sum(g.edges[p][0] for p in pairs), 3),
+                "solve_ms": round(solve_ms, 1),
+            }
     """)
 
     # Events
     write(ROOT / "app/api/v1/routes_events.py", """
-        from fastapi import APIRouter, Depends
+        from datetime import datetime, timedelta, timezone
+        from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+        from fastapi import APIRouter, Depends, HTTPException, Query
+        from fastapi.responses import Response
         from sqlalchemy import text
         from sqlalchemy.ext.asyncio import AsyncSession
-        from ...api.deps import get_db, require_user_id
-        from ...schemas.events import EventCreate
-        from ...utils.dbhelpers import row_to_dict
+        from ...api.deps import expansions, get_db, require_user_id
+        from ...core.config import settings
+        from ...schemas.events import EventCreate, Event, EventDay
+        from ...utils.dbhelpers import dumps, rows_response, rows_to_dicts, rows_with_authors_response
+        from ...utils.event_window import RANGE_ROWS, RANGE_SQL, by_day, window
 
         router = APIRouter()
 
+        def _zone(tz: str):
+            try:
+                return ZoneInfo(tz)
+            except (ZoneInfoNotFoundError, ValueError):
+                raise HTTPException(422, f"unknown time zone: {tz}")
+
         @router.post("", response_model=dict)
         async def create_event(payload: EventCreate, db: AsyncSession = Depends(get_db), user_id: str = Depends(require_user_id)):
             r = await db.execute(text(\"\"\"
@@ -314,22 +765,158 @@ def main():
             \"\"\"), {"uid": user_id, **payload.model_dump()})
             eid = r.scalar()
             await db.commit()
+            window.invalidate()
             return {"id": str(eid)}
 
-        @router.get("", response_model=list[dict])
-        async def list_events(db: AsyncSession = Depends(get_db)):
-            res = await db.execute(text("select id, host_id, title, type, starts_at, ends_at, location, tags, created_at from public.events order by starts_at asc limit 50"))
-            return [row_to_dict(r) for r in res.fetchall()]
+        @router.get("", response_model=list[Event])
+        async def list_events(expand: set[str] = Depends(expansions("author")), db: AsyncSession = Depends(get_db)):
+            res = await db.execute(text("select id, host_id, title, type, starts_at, ends_at, location, capacity, enrolled_count, tags, created_at from public.events order by starts_at asc limit 50"))
+            if "author" in expand:
+                return await rows_with_authors_response(db, res, "host_id")
+            return rows_response(res)
+
+        async def _between(db, start: datetime, end: datetime) -> list[dict]:
+            if window.covers(start, end):
+                return window.between(start, end)
+            # outside the cached window, or past the end of a truncated one
+            rows = rows_to_dicts(await db.execute(text(RANGE_SQL), {"start": start, "end": end, "n": RANGE_ROWS + 1}))
+            if len(rows) > RANGE_ROWS:
+                raise HTTPException(422, f"more than {RANGE_ROWS} events in range; ask for a shorter one")
+            return rows
+
+        @router.get("/upcoming", response_model=list[EventDay])
+        async def upcoming_events(days: int = Query(7, ge=1, le=60), tz: str = "UTC", db: AsyncSession = Depends(get_db)):
+            zone = _zone(tz)
+            await window.ensure(db)
+            now = datetime.now(timezone.utc)
+            end = min(now + timedelta(days=days), window.horizon)
+            return Response(dumps(by_day(await _between(db, now, end), zone)), media_type="application/json")
+
+        @router.get("/calendar", response_model=list[EventDay])
+        async def event_calendar(start: datetime = Query(..., alias="from"), end: datetime = Query(..., alias="to"),
+                                 tz: str = "UTC", db: AsyncSession = Depends(get_db)):
+            # dates without a time mean midnight, naive values are read in tz; `to` is exclusive
+            zone = _zone(tz)
+            start = start if start.tzinfo else start.replace(tzinfo=zone)
+            end = end if end.tzinfo else end.replace(tzinfo=zone)
+            if end <= start or end - start > timedelta(days=settings.EVENTS_CALENDAR_MAX_DAYS):
+                raise HTTPException(422, f"`to` must be after `from` and at most {settings.EVENTS_CALENDAR_MAX_DAYS} days later")
+            await window.ensure(db)
+            return Response(dumps(by_day(await _between(db, start, end), zone)), media_type="application/json")
+
+        # Capacity is enforced in the database (public.enroll_event / public.cancel_enrollment):
+        # the event row lock orders concurrent enrollments and enrolled_count decides going vs
+        # waitlist. Keep the transaction short so the lock is held briefly: the function call,
+        # then the count it left (still under the row lock) for the cached window row.
+        COUNT_SQL = "select enrolled_count from public.events where id = :eid"
 
         @router.post("/{event_id}/enroll", response_model=dict)
         async def enroll_event(event_id: str, db: AsyncSession = Depends(get_db), user_id: str = Depends(require_user_id)):
-            await db.execute(text(\"\"\"
-                insert into public.event_enrollments (event_id, user_id, status)
-                values (:eid, :uid, 'going')
-                on conflict do nothing
-            \"\"\"), {"eid": event_id, "uid": user_id})
+            status = (await db.execute(text("select public.enroll_event(:eid, :uid)"), {"eid": event_id, "uid": user_id})).scalar()
+            if status is None:
+                raise HTTPException(404, "event not found")
+            count = (await db.execute(text(COUNT_SQL), {"eid": event_id})).scalar()
+            await db.commit()
+            window.set_enrolled(event_id, count)
+            return {"enrolled": status == "going", "status": status}
+
+        @router.delete("/{event_id}/enroll", response_model=dict)
+        async def cancel_enrollment(event_id: str, db: AsyncSession = Depends(get_db), user_id: str = Depends(require_user_id)):
+            # a freed seat goes to the oldest waitlisted user, who gets a notification
+            previous = (await db.execute(text("select public.cancel_enrollment(:eid, :uid)"), {"eid": event_id, "uid": user_id})).scalar()
+            if previous is None:
+                raise HTTPException(404, "not enrolled")
+            count = (await db.execute(text(COUNT_SQL), {"eid": event_id})).scalar()
             await db.commit()
-            return {"enrolled": True}
+            window.set_enrolled(event_id, count)
+            return {"cancelled": True, "previous": previous}
+    """)
+
+    write(ROOT / "app/utils/event_window.py", """
+        # Public events from the start of yesterday (UTC) to EVENTS_WINDOW_DAYS ahead, kept in
+        # memory sorted by starts_at. Reloaded when older than EVENTS_WINDOW_TTL_SECONDS and
+        # right after this worker creates an event; other workers catch up within the TTL.
+        # Enrollments in this worker update enrolled_count on the cached row in place. More
+        # than WINDOW_ROWS events shorten the window; ranges past its end go to the database.
+        import asyncio
+        import bisect
+        import time
+        from collections import defaultdict
+        from datetime import datetime, timedelta, timezone, tzinfo
+        from typing import Optional
+        from loguru import logger
+        from sqlalchemy import text
+        from ..core.config import settings
+        from .dbhelpers import rows_to_dicts
+
+        WINDOW_ROWS = 100_000
+        RANGE_ROWS = 5000  # most events one uncached range read returns
+
+        EVENT_COLUMNS = "id, host_id, title, type, starts_at, ends_at, location, capacity, enrolled_count, tags, created_at"
+        # served by idx_events_public_starts (partial index on starts_at where visibility = 'public')
+        RANGE_SQL = f\"\"\"
+            select {EVENT_COLUMNS} from public.events
+            where visibility = 'public' and starts_at >= :start and starts_at < :end
+            order by starts_at, id
+            limit :n
+        \"\"\"
+
+        class EventWindow:
+            def __init__(self):
+                self.events: list[dict] = []
+                self._starts: list[datetime] = []
+                self._by_id: dict[str, dict] = {}
+                self.start = self.end = None  # what the cached rows cover, end exclusive
+                self.horizon = None  # where the window was asked to end
+                self.loaded_at = 0.0
+                self._lock = asyncio.Lock()
+
+            def stale(self) -> bool:
+                return time.monotonic() - self.loaded_at > settings.EVENTS_WINDOW_TTL_SECONDS
+
+            async def ensure(self, db):
+                if self.stale():
+                    async with self._lock:
+                        if self.stale():  # another request may have reloaded meanwhile
+                            await self.reload(db)
+
+            async def reload(self, db):
+                now = datetime.now(timezone.utc)
+                start = now.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=1)
+                end = now + timedelta(days=settings.EVENTS_WINDOW_DAYS)
+                horizon = end
+                rows = rows_to_dicts(await db.execute(text(RANGE_SQL), {"start": start, "end": end, "n": WINDOW_ROWS + 1}))
+                if len(rows) > WINDOW_ROWS:
+                    # cover only up to the first row left out, so covers() is still exact
+                    end = rows[WINDOW_ROWS]["starts_at"]
+                    rows = [r for r in rows[:WINDOW_ROWS] if r["starts_at"] < end]
+                    logger.warning("event window truncated to {} rows, ending {}", len(rows), end)
+                self.events, self._starts = rows, [r["starts_at"] for r in rows]
+                self._by_id = {str(r["id"]): r for r in rows}
+                self.start, self.end, self.horizon = start, end, horizon
+                self.loaded_at = time.monotonic()
+
+            def invalidate(self):
+                self.loaded_at = 0.0
+
+            def set_enrolled(self, event_id: str, count: Optional[int]):
+                row = self._by_id.get(event_id.lower())
+                if row is not None and count is not None:
+                    row["enrolled_count"] = count
+
+            def covers(self, start: datetime, end: datetime) -> bool:
+                return self.start is not None and start >= self.start and end <= self.end
+
+            def between(self, start: datetime, end: datetime) -> list[dict]:
+                return self.events[bisect.bisect_left(self._starts, start):bisect.bisect_left(self._starts, end)]
+
+        def by_day(events: list[dict], tz: tzinfo) -> list[dict]:
+            days = defaultdict(list)
+            for e in events:
+                days[e["starts_at"].astimezone(tz).date().isoformat()].append(e)
+            return [{"date": d, "events": evs} for d, evs in days.items()]  # events are sorted, so days are too
+
+        window = EventWindow()
     """)
 
     # Notifications
@@ -338,35 +925,122 @@ def main():
         from sqlalchemy import text
         from sqlalchemy.ext.asyncio import AsyncSession
         from ...api.deps import get_db, require_user_id
-        from ...utils.dbhelpers import row_to_dict
+        from ...schemas.notifications import Notification
+        from ...utils.dbhelpers import rows_response
 
         router = APIRouter()
 
-        @router.get("", response_model=list[dict])
+        @router.get("", response_model=list[Notification])
         async def my_notifications(db: AsyncSession = Depends(get_db), user_id: str = Depends(require_user_id)):
             res = await db.execute(text("select id, type, payload, read_at, created_at from public.notifications where user_id=:uid order by created_at desc limit 100"), {"uid": user_id})
-            return [row_to_dict(r) for r in res.fetchall()]
+            return rows_response(res)
     """)
 
     # Reports
     write(ROOT / "app/api/v1/routes_reports.py", """
-        from fastapi import APIRouter, Depends
+        from fastapi import APIRouter, Depends, HTTPException, Query
         from sqlalchemy import text
         from sqlalchemy.ext.asyncio import AsyncSession
-        from ...api.deps import get_db, require_user_id
-        from ...schemas.reports import ReportCreate
+        from ...api.deps import Viewer, get_db, get_viewer, require_user_id
+        from ...core.config import settings
+        from ...middleware.ratelimit import rate_limit
+        from ...schemas.reports import EntityKind, QueueDecision, QueueItem, ReportCreate
+        from ...utils.dbhelpers import rows_response
 
         router = APIRouter()
 
-        @router.post("", response_model=dict)
-        async def create_report(payload: ReportCreate, db: AsyncSession = Depends(get_db), user_id: str = Depends(require_user_id)):
+        # public.report_queue is maintained by a trigger on reports; hiding is what the
+        # API adds on top, always in the transaction that inserted or closed the reports.
+        # Only RFHs and content can be hidden; other entities are just queued.
+        HIDE_SQL = \"\"\"
+            with q as (
+                update public.report_queue set hidden_at = now(), hidden_from = case entity
+                    when 'rfh' then (select status::text from public.rfh where id = :eid)
+                    when 'content' then (select is_published::text from public.content where id = :eid) end
+                where entity = cast(:entity as entity_kind) and entity_id = :eid and hidden_at is null {cond}
+                returning entity
+            ), r as (
+                update public.rfh set status = 'hidden'
+                where id = :eid and exists (select 1 from q where entity = 'rfh') returning id
+            ), c as (
+                update public.content set is_published = false
+                where id = :eid and exists (select 1 from q where entity = 'content') returning id
+            )
+            select (select count(*) from r) + (select count(*) from c)
+        \"\"\"
+        # the count threshold needs that many different reporters; a single report's severity
+        # only hides when it comes from a trusted reporter
+        AUTOHIDE = \"\"\"
+            and ((:n > 0 and open_count >= :n and (
+                    select count(distinct r.reporter_id) from public.reports r
+                    where r.entity = report_queue.entity and r.entity_id = report_queue.entity_id and r.state <> 'closed') >= :n)
+                 or (:trusted and :sev > 0 and :severity >= :sev))
+        \"\"\"
+        TRUSTED_ROLES = frozenset({"editor", "moderator", "admin"})
+        # restores what HIDE_SQL replaced; entities hidden before hidden_from was recorded
+        # come back as an open RFH / published content
+        UNHIDE_SQL = \"\"\"
+            with q as (
+                update public.report_queue set hidden_at = null
+                where entity = cast(:entity as entity_kind) and entity_id = :eid and hidden_at is not null
+                returning entity, hidden_from
+            ), r as (
+                update public.rfh set status = coalesce(cast((select hidden_from from q) as rfh_status), 'open')
+                where id = :eid and status = 'hidden' and exists (select 1 from q where entity = 'rfh') returning id
+            ), c as (
+                update public.content set is_published = coalesce(cast((select hidden_from from q) as boolean), true)
+                where id = :eid and exists (select 1 from q where entity = 'content') returning id
+            )
+            select (select count(*) from r) + (select count(*) from c)
+        \"\"\"
+
+        def require_moderator(viewer: Viewer = Depends(get_viewer)) -> Viewer:
+            if not (viewer.is_admin or "moderator" in viewer.roles):
+                raise HTTPException(403, "moderators only")
+            return viewer
+
+        @router.post("", response_model=dict, dependencies=[Depends(rate_limit("report"))])
+        async def create_report(payload: ReportCreate, db: AsyncSession = Depends(get_db), user_id: str = Depends(require_user_id),
+                                viewer: Viewer = Depends(get_viewer)):
             r = await db.execute(text(\"\"\"
                 insert into public.reports (reporter_id, entity, entity_id, reason, severity)
                 values (:uid, :entity, :eid, :reason, :severity) returning id
             \"\"\"), {"uid": user_id, "entity": payload.entity, "eid": payload.entity_id, "reason": payload.reason, "severity": payload.severity})
             rid = r.scalar()
+            hidden = (await db.execute(text(HIDE_SQL.format(cond=AUTOHIDE)), {
+                "entity": payload.entity, "eid": payload.entity_id,
+                "n": settings.REPORT_AUTOHIDE_COUNT, "sev": settings.REPORT_AUTOHIDE_SEVERITY,
+                "severity": payload.severity, "trusted": bool(viewer.roles & TRUSTED_ROLES),
+            })).scalar()
             await db.commit()
-            return {"id": str(rid)}
+            return {"id": str(rid), "hidden": bool(hidden)}
+
+        @router.get("/queue", response_model=list[QueueItem])
+        async def report_queue(limit: int = Query(50, ge=1, le=200), viewer: Viewer = Depends(require_moderator),
+                               db: AsyncSession = Depends(get_db)):
+            # walks idx_report_queue_priority; entities without open reports are not in it
+            res = await db.execute(text(\"\"\"
+                select entity, entity_id, open_count, total_count, max_severity, priority,
+                       first_reported_at, last_reported_at, hidden_at
+                from public.report_queue where open_count > 0
+                order by priority desc, last_reported_at desc
+                limit :n
+            \"\"\"), {"n": limit})
+            return rows_response(res)
+
+        @router.post("/queue/{entity}/{entity_id}", response_model=dict)
+        async def decide(entity: EntityKind, entity_id: str, payload: QueueDecision, viewer: Viewer = Depends(require_moderator),
+                         db: AsyncSession = Depends(get_db)):
+            closed = await db.execute(text(\"\"\"
+                update public.reports set state = 'closed'
+                where entity = cast(:entity as entity_kind) and entity_id = :eid and state <> 'closed'
+                returning id
+            \"\"\"), {"entity": entity, "eid": entity_id})
+            n = len(closed.all())
+            sql = UNHIDE_SQL if payload.action == "dismiss" else HIDE_SQL.format(cond="")
+            changed = (await db.execute(text(sql), {"entity": entity, "eid": entity_id})).scalar()
+            await db.commit()
+            return {"closed": n, "changed": bool(changed)}
     """)
 
     # =========================
@@ -379,6 +1053,1127 @@ def main():
         exec uvicorn app.main:app --host 0.0.0.0 --port 8000
     """, executable=True, skip_if_exists=True)
 
+    write(ROOT / "bench/__init__.py", "")
+    write(ROOT / "bench/startup.py", """
+        # Cold-start benchmark: import time of app.main and time-to-first-request under uvicorn.
+        #   python -m bench.startup --runs 5 --modes tolerant,lazy --out startup.json
+        import argparse
+        import os
+        import socket
+        import statistics
+        import subprocess
+        import sys
+        import time
+
+        import httpx
+        import orjson
+
+        IMPORT_SNIPPET = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+
+
+        def free_port() -> int:
+            with socket.socket() as s:
+                s.bind(("127.0.0.1", 0))
+                return s.getsockname()[1]
+
+
+        def measure_import(env: dict) -> float:
+            out = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], env=env, capture_output=True, text=True, check=True)
+            return float(out.stdout.strip().splitlines()[-1]) * 1000
+
+
+        def measure_first_request(env: dict, path: str, timeout: float) -> float:
+            port = free_port()
+            t0 = time.perf_counter()
+            proc = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+                env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            try:
+                url = f"http://127.0.0.1:{port}{path}"
+                while time.perf_counter() - t0 < timeout:
+                    try:
+                        httpx.get(url, timeout=1.0)
+                        return (time.perf_counter() - t0) * 1000
+                    except httpx.TransportError:
+                        time.sleep(0.005)
+                raise RuntimeError(f"server did not answer {path} within {timeout}s")
+            finally:
+                proc.terminate()
+                proc.wait()
+
+
+        def summarize(samples: list[float]) -> dict:
+            return {"min_ms": round(min(samples), 1), "median_ms": round(statistics.median(samples), 1), "max_ms": round(max(samples), 1)}
+
+
+        def main():
+            ap = argparse.ArgumentParser()
+            ap.add_argument("--runs", type=int, default=5)
+            ap.add_argument("--modes", default="tolerant,lazy", help="comma separated ROUTERS_MODE values")
+            ap.add_argument("--path", default="/api/auth/me", help="first request path (use an optional route to include lazy imports)")
+            ap.add_argument("--timeout", type=float, default=30.0)
+            ap.add_argument("--out", help="write JSON results here")
+            args = ap.parse_args()
+
+            results = {}
+            for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+                env = {**os.environ, "ROUTERS_MODE": mode}
+                imports = [measure_import(env) for _ in range(args.runs)]
+                first = [measure_first_request(env, args.path, args.timeout) for _ in range(args.runs)]
+                results[mode] = {"import": summarize(imports), "time_to_first_request": summarize(first)}
+                print(f"{mode:<10} import {results[mode]['import']['median_ms']:8.1f} ms   "
+                      f"first request {results[mode]['time_to_first_request']['median_ms']:8.1f} ms")
+            if args.out:
+                with open(args.out, "wb") as f:
+                    f.write(orjson.dumps({"path": args.path, "runs": args.runs, "results": results}, option=orjson.OPT_INDENT_2))
+
+
+        if __name__ == "__main__":
+            main()
+    """)
+
+    write(ROOT / "bench/serialization.py", """
+        # Per-row cost of list serialization: the old row_to_dict -> response_model -> ORJSONResponse
+        # path against rows_to_json. No database needed; rows mimic asyncpg values.
+        #   python -m bench.serialization --rows 50,500,5000
+        import argparse
+        import asyncio
+        import time
+        import uuid
+        from datetime import datetime, timezone
+
+        from fastapi.responses import ORJSONResponse
+        from fastapi.routing import serialize_response
+        from fastapi.utils import create_model_field
+        from sqlalchemy.engine.result import IteratorResult, SimpleResultMetaData
+
+        from app.utils.dbhelpers import row_to_dict, rows_to_json
+
+        KEYS = ["id", "requester_id", "title", "body", "tags", "sensitivity", "anonymous", "status", "region",
+                "language", "created_at", "updated_at"]
+
+
+        def make_rows(n: int) -> list[tuple]:
+            now = datetime.now(timezone.utc)
+            return [(uuid.uuid4(), uuid.uuid4(), f"Need help with item {i}", "body text " * 30, ["flutter", "career"],
+                     "normal", False, "open", "istanbul", "tr", now, now) for i in range(n)]
+
+
+        def result(rows: list[tuple]):
+            return IteratorResult(SimpleResultMetaData(KEYS), iter(rows))
+
+
+        async def old_path(rows, field) -> bytes:
+            items = [row_to_dict(r) for r in result(rows).fetchall()]
+            content = await serialize_response(field=field, response_content=items)
+            return ORJSONResponse(content).body
+
+
+        async def fast_path(rows, field) -> bytes:
+            return rows_to_json(result(rows))
+
+
+        async def timeit(fn, rows, field, min_time: float) -> float:
+            n, t0 = 0, time.perf_counter()
+            while True:
+                await fn(rows, field)
+                n += 1
+                elapsed = time.perf_counter() - t0
+                if elapsed >= min_time:
+                    return elapsed / n
+
+
+        async def main():
+            ap = argparse.ArgumentParser()
+            ap.add_argument("--rows", default="50,500,5000")
+            ap.add_argument("--min-time", type=float, default=1.0)
+            args = ap.parse_args()
+            # the routes used response_model=list[dict]; that is what FastAPI validated and re-encoded
+            field = create_model_field("Response", list[dict], mode="serialization")
+            print(f"{'rows':>6}  {'path':<26}{'per call':>12}{'per row':>12}")
+            for n in [int(x) for x in args.rows.split(",")]:
+                rows = make_rows(n)
+                old = await timeit(old_path, rows, field, args.min_time)
+                new = await timeit(fast_path, rows, None, args.min_time)
+                print(f"{n:>6}  {'row_to_dict + list[dict]':<26}{old * 1e3:>10.3f}ms{old / n * 1e6:>10.2f}us")
+                print(f"{n:>6}  {'rows_to_json':<26}{new * 1e3:>10.3f}ms{new / n * 1e6:>10.2f}us  ({old / new:.1f}x)")
+
+
+        if __name__ == "__main__":
+            asyncio.run(main())
+    """)
+    write(ROOT / "bench/render.py", """
+        # Python-side vs Postgres-side JSON rendering of list pages, against DATABASE_URL.
+        #   python -m bench.render --sizes 50,500,5000 --repeat 20
+        # rfh runs with the requester masking of an unauthenticated caller; answers pages the
+        # question with the most answers, so its largest sizes are capped by that count.
+        import argparse
+        import asyncio
+        import statistics
+        import time
+
+        from sqlalchemy import text
+
+        from app.api.deps import Viewer
+        from app.api.v1.routes_qa import ANSWERS_SQL, QUESTIONS_SQL
+        from app.api.v1.routes_rfh import LIST_SQL as RFH_SQL, mask_params
+        from app.db.session import async_session, engine
+        from app.utils.dbhelpers import list_response
+
+        QUERIES = {
+            "rfh": (RFH_SQL + " order by created_at desc limit :n", "created_at desc", mask_params(Viewer())),
+            "questions": (QUESTIONS_SQL + " order by created_at desc limit :n", "created_at desc", {}),
+            "answers": (ANSWERS_SQL + " order by created_at asc limit :n", "created_at asc", {}),
+        }
+
+
+        async def busiest_question() -> str:
+            async with async_session() as db:
+                qid = (await db.execute(text(
+                    "select question_id from public.answers group by question_id order by count(*) desc limit 1"
+                ))).scalar()
+            return str(qid) if qid else "00000000-0000-0000-0000-000000000000"
+
+
+        async def run(sql: str, order_by: str, params: dict, mode: str, repeat: int) -> tuple[float, int]:
+            samples, nbytes = [], 0
+            async with async_session() as db:
+                await list_response(db, sql, params, order_by=order_by, mode=mode)  # warm
+                for _ in range(repeat):
+                    t0 = time.perf_counter()
+                    resp = await list_response(db, sql, params, order_by=order_by, mode=mode)
+                    samples.append((time.perf_counter() - t0) * 1000)
+                    nbytes = len(resp.body)
+            return statistics.median(samples), nbytes
+
+
+        async def main():
+            ap = argparse.ArgumentParser()
+            ap.add_argument("--sizes", default="50,500,5000")
+            ap.add_argument("--repeat", type=int, default=20)
+            args = ap.parse_args()
+            print(f"{'query':<10}{'rows':>6}{'python ms':>12}{'db ms':>10}{'speedup':>9}{'bytes':>10}")
+            try:
+                QUERIES["answers"][2]["qid"] = await busiest_question()
+                for name, (sql, order_by, params) in QUERIES.items():
+                    for size in [int(x) for x in args.sizes.split(",")]:
+                        p = params | {"n": size}
+                        py, nbytes = await run(sql, order_by, p, "python", args.repeat)
+                        pg, _ = await run(sql, order_by, p, "db", args.repeat)
+                        print(f"{name:<10}{size:>6}{py:>12.2f}{pg:>10.2f}{py / pg:>8.2f}x{nbytes:>10}")
+            finally:
+                await engine.dispose()
+
+
+        if __name__ == "__main__":
+            asyncio.run(main())
+    """)
+    write(ROOT / "bench/expand.py", """
+        # Cost of ?expand=author on the list endpoints, against DATABASE_URL.
+        #   python -m bench.expand --repeat 50
+        # "cold" clears the profile card cache before every call (one id = any(:ids) query
+        # per page), "warm" serves every card from the cache.
+        import argparse
+        import asyncio
+        import statistics
+        import time
+
+        from app.api.deps import Fieldset, Viewer
+        from app.api.v1.routes_content import list_content
+        from app.api.v1.routes_events import list_events
+        from app.api.v1.routes_projects import list_projects
+        from app.api.v1.routes_qa import QUESTION_COLUMNS, QUESTION_FIELD_SOURCES, QUESTION_FIELDS, list_questions
+        from app.api.v1.routes_rfh import COLUMNS as RFH_COLUMNS, FIELD_SOURCES as RFH_FIELD_SOURCES, FIELDS as RFH_FIELDS, list_rfh
+        from app.db.session import async_session, engine
+        from app.utils import profile_cards
+
+        RFH_ALL = Fieldset(tuple(RFH_COLUMNS.split(", ")), RFH_FIELDS, RFH_FIELD_SOURCES)
+        QUESTIONS_ALL = Fieldset(QUESTION_COLUMNS, QUESTION_FIELDS, QUESTION_FIELD_SOURCES)
+
+        ENDPOINTS = {
+            "rfh": lambda db, expand: list_rfh(q=None, tag=None, expand=expand, fields=RFH_ALL, viewer=Viewer(), db=db),
+            "content": lambda db, expand: list_content(q=None, tag=None, expand=expand, db=db),
+            "questions": lambda db, expand: list_questions(q=None, tag=None, expand=expand, fields=QUESTIONS_ALL, db=db),
+            "projects": lambda db, expand: list_projects(expand=expand, db=db),
+            "events": lambda db, expand: list_events(expand=expand, db=db),
+        }
+
+
+        async def run(call, expand: set, repeat: int, cold: bool) -> tuple[float, int]:
+            samples, nbytes = [], 0
+            async with async_session() as db:
+                await call(db, expand)  # warm connection and cache
+                for _ in range(repeat):
+                    if cold:
+                        profile_cards.cards.clear()
+                    t0 = time.perf_counter()
+                    resp = await call(db, expand)
+                    samples.append((time.perf_counter() - t0) * 1000)
+                    nbytes = len(resp.body)
+            return statistics.median(samples), nbytes
+
+
+        async def main():
+            ap = argparse.ArgumentParser()
+            ap.add_argument("--repeat", type=int, default=50)
+            args = ap.parse_args()
+            print(f"{'endpoint':<10}{'plain ms':>10}{'cold ms':>10}{'warm ms':>10}{'plain B':>10}{'author B':>10}")
+            try:
+                for name, call in ENDPOINTS.items():
+                    plain, b0 = await run(call, set(), args.repeat, False)
+                    cold, b1 = await run(call, {"author"}, args.repeat, True)
+                    warm, _ = await run(call, {"author"}, args.repeat, False)
+                    print(f"{name:<10}{plain:>10.2f}{cold:>10.2f}{warm:>10.2f}{b0:>10}{b1:>10}")
+            finally:
+                await engine.dispose()
+
+
+        if __name__ == "__main__":
+            asyncio.run(main())
+    """)
+    write(ROOT / "bench/fields.py", """
+        # Payload size and latency of ?fields= on the list endpoints, against DATABASE_URL.
+        #   python -m bench.fields --repeat 50 --fields id,title,snippet,created_at
+        import argparse
+        import asyncio
+        import statistics
+        import time
+
+        from app.api.deps import Fieldset, Viewer
+        from app.api.v1.routes_qa import QUESTION_COLUMNS, QUESTION_FIELD_SOURCES, QUESTION_FIELDS, list_questions
+        from app.api.v1.routes_rfh import COLUMNS as RFH_COLUMNS, FIELD_SOURCES as RFH_FIELD_SOURCES, FIELDS as RFH_FIELDS, list_rfh
+        from app.db.session import async_session, engine
+
+        ENDPOINTS = {
+            "rfh": (RFH_FIELDS, RFH_FIELD_SOURCES, tuple(RFH_COLUMNS.split(", ")),
+                    lambda db, fields: list_rfh(q=None, tag=None, expand=set(), fields=fields, viewer=Viewer(), db=db)),
+            "questions": (QUESTION_FIELDS, QUESTION_FIELD_SOURCES, QUESTION_COLUMNS,
+                          lambda db, fields: list_questions(q=None, tag=None, expand=set(), fields=fields, db=db)),
+        }
+
+
+        async def run(call, fields: Fieldset, repeat: int) -> tuple[float, int]:
+            samples, nbytes = [], 0
+            async with async_session() as db:
+                await call(db, fields)  # warm
+                for _ in range(repeat):
+                    t0 = time.perf_counter()
+                    resp = await call(db, fields)
+                    samples.append((time.perf_counter() - t0) * 1000)
+                    nbytes = len(resp.body)
+            return statistics.median(samples), nbytes
+
+
+        async def main():
+            ap = argparse.ArgumentParser()
+            ap.add_argument("--repeat", type=int, default=50)
+            ap.add_argument("--fields", default="id,title,snippet,created_at")
+            args = ap.parse_args()
+            sparse = tuple(args.fields.split(","))
+            print(f"{'endpoint':<10}{'full ms':>9}{'sparse ms':>11}{'full B':>9}{'sparse B':>10}{'bytes':>8}")
+            try:
+                for name, (exprs, sources, columns, call) in ENDPOINTS.items():
+                    full, b0 = await run(call, Fieldset(columns, exprs, sources), args.repeat)
+                    part, b1 = await run(call, Fieldset(sparse, exprs, sources), args.repeat)
+                    print(f"{name:<10}{full:>9.2f}{part:>11.2f}{b0:>9}{b1:>10}{b1 / b0:>7.0%}")
+            finally:
+                await engine.dispose()
+
+
+        if __name__ == "__main__":
+            asyncio.run(main())
+    """)
+    write(ROOT / "bench/text_match.py", """
+        # TF-IDF matcher on a synthetic profile corpus (no database needed).
+        #   python -m bench.text_match --profiles 100000 --queries 200
+        import argparse
+        import random
+        import statistics
+        import time
+
+        from app.match.text import TextIndex
+
+
+        def corpus(n_words: int, rnd: random.Random) -> list[str]:
+            letters = "abcdefghijklmnoprstuvyz"
+            return ["".join(rnd.choice(letters) for _ in range(rnd.randint(4, 10))) for _ in range(n_words)]
+
+
+        def main():
+            ap = argparse.ArgumentParser()
+            ap.add_argument("--profiles", type=int, default=100_000)
+            ap.add_argument("--queries", type=int, default=200)
+            ap.add_argument("--vocab", type=int, default=20_000)
+            ap.add_argument("--k", type=int, default=50)
+            args = ap.parse_args()
+            rnd = random.Random(7)
+            words = corpus(args.vocab, rnd)
+            weights = [1 / (i + 1) for i in range(len(words))]  # Zipf-like term frequencies
+
+            def doc(n: int) -> str:
+                return " ".join(rnd.choices(words, weights, k=n))
+
+            index = TextIndex()
+            docs = [(f"p{i}", doc(rnd.randint(10, 60))) for i in range(args.profiles)]
+            t0 = time.perf_counter()
+            index.apply(docs)
+            build = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            index.apply([(f"p{i}", doc(30)) for i in range(100)])
+            update = time.perf_counter() - t0
+
+            samples = []
+            for _ in range(args.queries):
+                q = doc(rnd.randint(8, 40))
+                t0 = time.perf_counter()
+                index.query(q, args.k)
+                samples.append((time.perf_counter() - t0) * 1000)
+            samples.sort()
+            print(f"profiles {len(index)}  terms {len(index.vocab)}  nnz {index._snap.matrix.nnz}")
+            print(f"full build      {build * 1000:9.1f} ms")
+            print(f"100-profile update + republish {update * 1000:9.1f} ms")
+            print(f"query p50 {statistics.median(samples):.2f} ms  p95 {samples[int(len(samples) * 0.95) - 1]:.2f} ms  max {samples[-1]:.2f} ms")
+
+
+        if __name__ == "__main__":
+            main()
+    """)
+    write(ROOT / "bench/dedup.py", """
+        # MinHash/LSH duplicate lookups on a synthetic corpus (no database needed).
+        #   python -m bench.dedup --docs 200000 --queries 500
+        import argparse
+        import random
+        import statistics
+        import time
+
+        from app.match.dedup import DedupIndex
+
+
+        def main():
+            ap = argparse.ArgumentParser()
+            ap.add_argument("--docs", type=int, default=200_000)
+            ap.add_argument("--queries", type=int, default=500)
+            args = ap.parse_args()
+            rnd = random.Random(11)
+            words = ["".join(rnd.choice("abcdefghijklmnoprstuvyz") for _ in range(rnd.randint(3, 9))) for _ in range(5000)]
+
+            def doc() -> str:
+                return " ".join(rnd.choices(words, k=rnd.randint(15, 80)))
+
+            index = DedupIndex()
+            corpus = [doc() for _ in range(args.docs)]
+            t0 = time.perf_counter()
+            for i, d in enumerate(corpus):
+                index.add(f"d{i}", "rfh", d[:60], d)
+            build = time.perf_counter() - t0
+
+            found, samples = 0, []
+            for i in range(args.queries):
+                words_ = corpus[rnd.randrange(len(corpus))].split()
+                if i % 2:  # half the queries are light edits of an indexed document
+                    words_[rnd.randrange(len(words_))] = rnd.choice(words)
+                else:
+                    words_ = doc().split()
+                q = " ".join(words_)
+                t0 = time.perf_counter()
+                hits = index.similar(q[:60], q)
+                samples.append((time.perf_counter() - t0) * 1000)
+                found += bool(hits) and i % 2
+            samples.sort()
+            print(f"docs {len(index)}  build {build:.1f}s")
+            print(f"lookup p50 {statistics.median(samples):.3f} ms  p95 {samples[int(len(samples) * 0.95) - 1]:.3f} ms  max {samples[-1]:.3f} ms")
+            print(f"edited duplicates found {found}/{args.queries // 2}")
+
+
+        if __name__ == "__main__":
+            main()
+    """)
+    write(ROOT / "bench/ratelimit.py", """
+        # Per-request cost of the write rate limiter (in-memory buckets).
+        #   python -m bench.ratelimit --n 200000 --keys 10000
+        import argparse
+        import asyncio
+        import time
+
+        from fastapi import Response
+        from starlette.requests import Request
+
+        from app.middleware.ratelimit import MemoryBuckets, Policy, rate_limit, set_backend
+
+
+        def fake_request(ip: str) -> Request:
+            return Request({"type": "http", "method": "POST", "path": "/api/rfh", "headers": [], "client": (ip, 1234)})
+
+
+        async def main():
+            ap = argparse.ArgumentParser()
+            ap.add_argument("--n", type=int, default=200_000)
+            ap.add_argument("--keys", type=int, default=10_000)
+            args = ap.parse_args()
+
+            buckets = MemoryBuckets()
+            p = Policy(10**9, 1.0)  # never throttles, so every call takes the full path
+            keys = [f"write:u:{i}" for i in range(args.keys)]
+            t0 = time.perf_counter()
+            for i in range(args.n):
+                await buckets.take(keys[i % args.keys], p)
+            take_us = (time.perf_counter() - t0) / args.n * 1e6
+
+            set_backend(MemoryBuckets())
+            dep = rate_limit("write")
+            reqs = [fake_request(f"10.0.{i // 256 % 256}.{i % 256}") for i in range(args.keys)]
+            users = [f"user-{i}" for i in range(args.keys)]
+            t0 = time.perf_counter()
+            for i in range(args.n):
+                k = i % args.keys
+                try:
+                    await dep(reqs[k], Response(), users[k])
+                except Exception:
+                    pass  # throttled calls cost the same or less
+            dep_us = (time.perf_counter() - t0) / args.n * 1e6
+
+            print(f"bucket take:          {take_us:6.2f} us")
+            print(f"dependency (user+ip): {dep_us:6.2f} us")
+
+
+        if __name__ == "__main__":
+            asyncio.run(main())
+    """)
+    write(ROOT / "bench/enroll.py", """
+        # Hundreds of simultaneous enrollments into one event, then a wave of cancellations.
+        # Checks that nobody is overbooked and every freed seat went to the waitlist.
+        #   python -m bench.enroll --users 500 --capacity 100 --connections 50
+        #   python -m bench.enroll --naive   # count-then-insert, for comparison
+        import argparse
+        import asyncio
+        import random
+        import time
+
+        from sqlalchemy import text
+        from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+        from app.core.config import settings
+
+        # what enrollment looked like before the counter: a read and a write with a race in between
+        NAIVE_SQL = \"\"\"
+            insert into public.event_enrollments (event_id, user_id, status)
+            select :eid, :uid, case when e.capacity is null or
+                   (select count(*) from public.event_enrollments x where x.event_id = e.id and x.status = 'going') < e.capacity
+                   then 'going' else 'waitlist' end
+            from public.events e where e.id = :eid
+            on conflict do nothing
+        \"\"\"
+
+
+        async def timed(sessions, sql: str, params: list[dict]) -> float:
+            async def one(p):
+                async with sessions() as db:
+                    await db.execute(text(sql), p)
+                    await db.commit()
+
+            t0 = time.perf_counter()
+            await asyncio.gather(*(one(p) for p in params))
+            return time.perf_counter() - t0
+
+
+        async def main():
+            ap = argparse.ArgumentParser()
+            ap.add_argument("--users", type=int, default=500)
+            ap.add_argument("--capacity", type=int, default=100)
+            ap.add_argument("--cancel", type=int, default=50, help="going users who cancel afterwards")
+            ap.add_argument("--connections", type=int, default=50)
+            ap.add_argument("--naive", action="store_true")
+            args = ap.parse_args()
+            engine = create_async_engine(settings.DATABASE_URL, pool_size=args.connections, max_overflow=0)
+            sessions = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+            try:
+                async with sessions() as db:
+                    users = [str(u) for u in (await db.execute(text("select id from public.profiles limit :n"), {"n": args.users})).scalars()]
+                    eid = (await db.execute(text(
+                        "insert into public.events (host_id, title, type, starts_at, capacity) "
+                        "values (:uid, 'enroll bench', 'workshop', now() + interval '7 days', :cap) returning id"
+                    ), {"uid": users[0], "cap": args.capacity})).scalar()
+                    await db.commit()
+                random.Random(3).shuffle(users)
+                sql = NAIVE_SQL if args.naive else "select public.enroll_event(:eid, :uid)"
+                took = await timed(sessions, sql, [{"eid": eid, "uid": u} for u in users])
+                print(f"{len(users)} enrollments over {args.connections} connections: "
+                      f"{took * 1000:.0f} ms, {len(users) / took:.0f}/s")
+
+                if not args.naive:
+                    async with sessions() as db:
+                        going = (await db.execute(text(
+                            "select user_id from public.event_enrollments where event_id = :eid and status = 'going'"
+                        ), {"eid": eid})).scalars().all()
+                    leavers = [{"eid": eid, "uid": u} for u in going[:args.cancel]]
+                    took = await timed(sessions, "select public.cancel_enrollment(:eid, :uid)", leavers)
+                    print(f"{len(leavers)} cancellations: {took * 1000:.0f} ms, {len(leavers) / max(took, 1e-9):.0f}/s")
+
+                async with sessions() as db:
+                    going, waiting, counter = (await db.execute(text(\"\"\"
+                        select count(*) filter (where en.status = 'going'), count(*) filter (where en.status = 'waitlist'),
+                               (select enrolled_count from public.events where id = :eid)
+                        from public.event_enrollments en where en.event_id = :eid
+                    \"\"\"), {"eid": eid})).one()
+                    await db.execute(text("delete from public.events where id = :eid"), {"eid": eid})
+                    await db.commit()
+                expected = min(args.capacity, len(users) - (0 if args.naive else min(args.cancel, args.capacity)))
+                ok = going <= args.capacity and (args.naive or (going == counter and going == expected))
+                print(f"capacity {args.capacity}  going {going}  waitlist {waiting}  counter {counter}  -> {'OK' if ok else 'OVERBOOKED / INCONSISTENT'}")
+            finally:
+                await engine.dispose()
+
+
+        if __name__ == "__main__":
+            asyncio.run(main())
+    """)
+    write(ROOT / "bench/teams.py", """
+        # Team-formation solver on synthetic application graphs (no database needed).
+        #   python -m bench.teams --sizes 100,1000,5000,10000
+        import argparse
+        import random
+        import time
+
+        from app.match.teams import greedy, solve
+
+
+        def graph(nodes: int, rnd: random.Random) -> tuple[int, int, dict]:
+            # about as many applicants as slots; each applicant applies to ~3 projects of ~3 slots
+            n_rows, n_cols = nodes // 2, nodes - nodes // 2
+            projects = [list(range(i, min(i + 3, n_cols))) for i in range(0, n_cols, 3)]
+            edges = {}
+            for i in range(n_rows):
+                for p in rnd.sample(projects, min(3, len(projects))):
+                    for j in p:
+                        edges[(i, j)] = (1.0 + rnd.choice((0.0, 4.0)) + 2.0 * rnd.random() + rnd.choice((0.0, 1.0)), None)
+            return n_rows, n_cols, edges
+
+
+        def main():
+            ap = argparse.ArgumentParser()
+            ap.add_argument("--sizes", default="100,1000,5000,10000")
+            args = ap.parse_args()
+            rnd = random.Random(5)
+            print(f"{'nodes':>7}{'edges':>9}{'solve ms':>10}{'greedy ms':>11}{'weight':>10}{'greedy w':>10}{'matched':>9}")
+            for nodes in (int(n) for n in args.sizes.split(",")):
+                n_rows, n_cols, edges = graph(nodes, rnd)
+                t0 = time.perf_counter()
+                pairs = solve(n_rows, n_cols, edges)
+                opt_ms = (time.perf_counter() - t0) * 1000
+                t0 = time.perf_counter()
+                fast = greedy(edges)
+                greedy_ms = (time.perf_counter() - t0) * 1000
+                w = sum(edges[p][0] for p in pairs)
+                gw = sum(edges[p][0] for p in fast)
+                print(f"{nodes:>7}{len(edges):>9}{opt_ms:>10.1f}{greedy_ms:>11.1f}{w:>10.1f}{gw:>10.1f}{len(pairs):>9}")
+
+
+        if __name__ == "__main__":
+            main()
+    """)
+    write(ROOT / "bench/match_filters.py", """
+        # match_helpers latency with and without hard filters, against the configured database.
+        # Times _rank, the whole route body: RFH lookup, text index query and ranking SQL.
+        #   python -m bench.match_filters --rfh 50 --repeat 5
+        #   python -m bench.match_filters --no-text   # text index left empty: the tag-only query
+        import argparse
+        import asyncio
+        import statistics
+        import time
+
+        from sqlalchemy import text
+
+        from app.api.v1.routes_match import _rank
+        from app.db.session import async_session, engine
+        from app.match.text import text_index
+
+        CASES = {
+            "none": frozenset(),
+            "language": frozenset({"language"}),
+            "language,region": frozenset({"language", "region"}),
+            "language,timezone": frozenset({"language", "timezone"}),
+            "all": frozenset({"language", "region", "country", "timezone"}),
+        }
+
+
+        async def main():
+            ap = argparse.ArgumentParser()
+            ap.add_argument("--rfh", type=int, default=50)
+            ap.add_argument("--repeat", type=int, default=5)
+            ap.add_argument("--window", type=int, default=3)
+            ap.add_argument("--no-text", action="store_true")
+            args = ap.parse_args()
+            try:
+                if not args.no_text:
+                    await text_index.refresh(async_session)  # as in a running worker
+                async with async_session() as db:
+                    ids = [str(i) for i in (await db.execute(text(
+                        "select id from public.rfh where status = 'open' order by created_at desc limit :n"), {"n": args.rfh})).scalars()]
+                    print(f"{'hard filters':<20}{'p50 ms':>9}{'p95 ms':>9}")
+                    for name, hard in CASES.items():
+                        samples = []
+                        for _ in range(args.repeat):
+                            for rid in ids:
+                                t0 = time.perf_counter()
+                                await _rank(db, rid, hard, frozenset(), args.window)
+                                samples.append((time.perf_counter() - t0) * 1000)
+                        samples.sort()
+                        print(f"{name:<20}{statistics.median(samples):>9.2f}{samples[int(len(samples) * 0.95) - 1]:>9.2f}")
+            finally:
+                await engine.dispose()
+
+
+        if __name__ == "__main__":
+            asyncio.run(main())
+    """)
+    write(ROOT / "loadtest/__init__.py", "")
+    write(ROOT / "loadtest/README.md", """
+        # Load testing
+
+        Everything runs locally: a plain Postgres, a JWKS stand-in for Supabase auth
+        and the API under test.
+
+        ```bash
+        # 1) database: auth stand-in first, then the platform schema from the repo root
+        createdb novabridge_load
+        psql -d novabridge_load -f loadtest/auth_stub.sql -f ../Supabase.sql
+
+        # 2) JWKS stand-in (generates .loadtest/jwt_key.pem on first use)
+        python -m loadtest.auth_stub serve --port 9999 &
+
+        # 3) API pointed at both
+        export DATABASE_URL=postgresql+asyncpg://localhost/novabridge_load
+        export SUPABASE_JWKS_URL=http://127.0.0.1:9999/jwks.json DEV_ALLOW_UNVERIFIED=false
+        export RATE_LIMIT_ENABLED=false   # every virtual user shares one client IP
+        ./run.sh &
+
+        # 4) synthetic data, then a run
+        python -m loadtest.seed --users 500 --rfh 5000 --content 2000 --questions 2000
+        python -m loadtest.run --duration 60 --concurrency 50 --out results/$(git rev-parse --short HEAD).json
+        python -m loadtest.run --duration 60 --concurrency 50 --compare results/<older>.json
+        ```
+
+        Scenario weights are set with `--mix browse_rfh=40,create_rfh=5,...`; unknown
+        names are rejected. Results contain throughput, error rate and p50/p95/p99 per
+        endpoint template plus the git commit they were taken on.
+    """)
+    write(ROOT / "loadtest/auth_stub.sql", """
+        -- Minimal stand-in for the Supabase auth schema so Supabase.sql runs on a plain Postgres.
+        create schema if not exists auth;
+        create table if not exists auth.users (
+          id uuid primary key default gen_random_uuid(),
+          email text,
+          raw_user_meta_data jsonb default '{}'::jsonb
+        );
+        create or replace function auth.uid() returns uuid language sql stable as $$
+          select nullif(current_setting('request.jwt.claim.sub', true), '')::uuid
+        $$;
+    """)
+    write(ROOT / "loadtest/auth_stub.py", """
+        # Local stand-in for Supabase auth: one RSA key, a JWKS endpoint and token minting.
+        #   python -m loadtest.auth_stub serve --port 9999
+        #   python -m loadtest.auth_stub mint <user-uuid>
+        import argparse
+        import os
+        import time
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from pathlib import Path
+
+        import orjson
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import rsa
+        from jose import jwk, jwt
+
+        KEY_PATH = Path(os.getenv("LOADTEST_KEY", ".loadtest/jwt_key.pem"))
+        KID = "loadtest"
+        AUDIENCE = os.getenv("SUPABASE_AUDIENCE", "authenticated")
+
+
+        def private_pem() -> bytes:
+            if not KEY_PATH.exists():
+                KEY_PATH.parent.mkdir(parents=True, exist_ok=True)
+                key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+                KEY_PATH.write_bytes(key.private_bytes(
+                    serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption(),
+                ))
+            return KEY_PATH.read_bytes()
+
+
+        def jwks() -> dict:
+            key = serialization.load_pem_private_key(private_pem(), password=None)
+            public = key.public_key().public_bytes(serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo)
+            entry = jwk.construct(public, "RS256").to_dict()
+            entry.update({"kid": KID, "alg": "RS256", "use": "sig"})
+            return {"keys": [entry]}
+
+
+        def mint(sub: str, ttl: int = 3600) -> str:
+            now = int(time.time())
+            claims = {"sub": sub, "aud": AUDIENCE, "role": "authenticated", "iat": now, "exp": now + ttl}
+            return jwt.encode(claims, private_pem().decode(), algorithm="RS256", headers={"kid": KID})
+
+
+        def serve(port: int):
+            body = orjson.dumps(jwks())
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, *args):
+                    pass
+
+            print(f"JWKS stand-in on http://127.0.0.1:{port}/jwks.json")
+            ThreadingHTTPServer(("127.0.0.1", port), Handler).serve_forever()
+
+
+        def main():
+            ap = argparse.ArgumentParser()
+            sub = ap.add_subparsers(dest="cmd", required=True)
+            sp = sub.add_parser("serve")
+            sp.add_argument("--port", type=int, default=9999)
+            mp = sub.add_parser("mint")
+            mp.add_argument("user_id")
+            mp.add_argument("--ttl", type=int, default=3600)
+            args = ap.parse_args()
+            if args.cmd == "serve":
+                serve(args.port)
+            else:
+                print(mint(args.user_id, args.ttl))
+
+
+        if __name__ == "__main__":
+            main()
+    """)
+    write(ROOT / "loadtest/seed.py", """
+        # Seeds a local database with synthetic users and content for load tests.
+        #   python -m loadtest.seed --users 500 --rfh 5000 [--reset]
+        import argparse
+        import asyncio
+        import os
+        import random
+        import uuid
+        from datetime import datetime, timedelta, timezone
+        from pathlib import Path
+
+        import asyncpg
+        import orjson
+
+        SEED_PATH = Path(".loadtest/seed.json")
+        TAGS = ["addiction-recovery", "leadership", "software-testing", "flutter", "fastapi", "ai-ml", "career",
+                "fundraising", "mentoring", "design", "legal", "health", "education", "housing", "translation"]
+        WORDS = ("help need looking for mentor guide advice project team learn share best practice story "
+                 "question answer support community local remote startup career code review plan").split()
+        PLACES = {  # region -> (country, timezone)
+            "istanbul": ("TR", "Europe/Istanbul"), "ankara": ("TR", "Europe/Istanbul"), "izmir": ("TR", "Europe/Istanbul"),
+            "berlin": ("DE", "Europe/Berlin"), "london": ("GB", "Europe/London"), "remote": ("US", "America/New_York"),
+        }
+        REGIONS = list(PLACES)
+        LANGS = ["tr", "en", "de"]
+        CONTENT_TYPES = ["best_practice", "story", "case_study", "guide", "material"]
+        EVENT_TYPES = ["course", "webinar", "workshop"]
+
+
+        def sentence(n: int) -> str:
+            return " ".join(random.choice(WORDS) for _ in range(n)).capitalize()
+
+
+        def ago(days: int) -> datetime:
+            return datetime.now(timezone.utc) - timedelta(days=random.uniform(0, days))
+
+
+        async def seed(conn: asyncpg.Connection, args):
+            if args.reset:
+                await conn.execute("truncate auth.users cascade")
+            users = [uuid.uuid4() for _ in range(args.users)]
+            await conn.executemany(
+                "insert into auth.users (id, email) values ($1, $2)",
+                [(u, f"load-{u.hex[:12]}@example.test") for u in users],
+            )
+            regions = [random.choice(REGIONS) for _ in users]
+            await conn.executemany(
+                "update public.profiles set bio=$2, offers=$3, needs=$4, languages=$5, region=$6, reputation=$7, "
+                "country=$8, timezone=$9 where id=$1",
+                [(u, sentence(20), random.sample(TAGS, 3), random.sample(TAGS, 2), random.sample(LANGS, 2),
+                  r, random.randint(0, 500), *PLACES[r]) for u, r in zip(users, regions)],
+            )
+            rfh = [(uuid.uuid4(), random.choice(users), sentence(6), sentence(60), random.sample(TAGS, 2),
+                    random.random() < 0.2, random.choice(REGIONS), random.choice(LANGS), ago(90)) for _ in range(args.rfh)]
+            await conn.executemany(
+                "insert into public.rfh (id, requester_id, title, body, tags, anonymous, region, language, created_at) "
+                "values ($1, $2, $3, $4, $5, $6, $7, $8, $9)", rfh,
+            )
+            await conn.executemany(
+                "insert into public.content (author_id, type, title, summary, body, created_at) "
+                "values ($1, $2::content_type, $3, $4, $5, $6)",
+                [(random.choice(users), random.choice(CONTENT_TYPES), sentence(6), sentence(25), sentence(200), ago(180))
+                 for _ in range(args.content)],
+            )
+            questions = [(uuid.uuid4(), random.choice(users), sentence(8), sentence(50), random.sample(TAGS, 2), ago(120))
+                         for _ in range(args.questions)]
+            await conn.executemany(
+                "insert into public.questions (id, asker_id, title, body, tags, created_at) values ($1, $2, $3, $4, $5, $6)",
+                questions,
+            )
+            await conn.executemany(
+                "insert into public.answers (question_id, author_id, body, created_at) values ($1, $2, $3, $4)",
+                [(random.choice(questions)[0], random.choice(users), sentence(40), ago(60)) for _ in range(args.questions * 3)],
+            )
+            await conn.executemany(
+                "insert into public.projects (owner_id, title, description, needed_roles, region, tags) values ($1, $2, $3, $4, $5, $6)",
+                [(random.choice(users), sentence(5), sentence(40), random.sample(TAGS, 2), random.choice(REGIONS),
+                  random.sample(TAGS, 3)) for _ in range(args.projects)],
+            )
+            now = datetime.now(timezone.utc)
+            await conn.executemany(
+                "insert into public.events (host_id, title, description, type, starts_at, capacity, tags) "
+                "values ($1, $2, $3, $4::content_type, $5, $6, $7)",
+                [(random.choice(users), sentence(5), sentence(30), random.choice(EVENT_TYPES),
+                  now + timedelta(days=random.uniform(-120, 60)), random.choice([None, 20, 50, 200]), random.sample(TAGS, 2))
+                 for _ in range(args.events)],
+            )
+            await conn.executemany(
+                "insert into public.notifications (user_id, type, payload, created_at) values ($1, $2, $3::jsonb, $4)",
+                [(random.choice(users), "match", orjson.dumps({"rfh_id": str(random.choice(rfh)[0])}).decode(), ago(30))
+                 for _ in range(args.users * 10)],
+            )
+            return {"users": [str(u) for u in users], "rfh": [str(r[0]) for r in rfh[:1000]],
+                    "questions": [str(q[0]) for q in questions[:1000]]}
+
+
+        async def main():
+            ap = argparse.ArgumentParser()
+            ap.add_argument("--dsn", default=os.getenv("DATABASE_URL", "").replace("postgresql+asyncpg://", "postgresql://"))
+            ap.add_argument("--users", type=int, default=500)
+            ap.add_argument("--rfh", type=int, default=5000)
+            ap.add_argument("--content", type=int, default=2000)
+            ap.add_argument("--questions", type=int, default=2000)
+            ap.add_argument("--projects", type=int, default=500)
+            ap.add_argument("--events", type=int, default=1000)
+            ap.add_argument("--reset", action="store_true", help="truncate auth.users (cascades to all seeded rows) first")
+            ap.add_argument("--random-seed", type=int, default=42)
+            args = ap.parse_args()
+            random.seed(args.random_seed)
+            conn = await asyncpg.connect(args.dsn)
+            try:
+                async with conn.transaction():
+                    ids = await seed(conn, args)
+            finally:
+                await conn.close()
+            SEED_PATH.parent.mkdir(parents=True, exist_ok=True)
+            SEED_PATH.write_bytes(orjson.dumps(ids))
+            print(f"seeded {args.users} users, {args.rfh} rfh, {args.content} content, {args.questions} questions -> {SEED_PATH}")
+
+
+        if __name__ == "__main__":
+            asyncio.run(main())
+    """)
+    write(ROOT / "loadtest/run.py", """
+        # Closed-loop load generator: N virtual users replay a weighted scenario mix.
+        #   python -m loadtest.run --base-url http://127.0.0.1:8000/api --duration 60 --concurrency 50 --out run.json
+        import argparse
+        import asyncio
+        import random
+        import subprocess
+        import time
+        from collections import defaultdict
+        from datetime import datetime, timezone
+
+        import httpx
+        import orjson
+
+        from .auth_stub import mint
+        from .seed import SEED_PATH, TAGS, sentence
+
+
+        class Recorder:
+            def __init__(self):
+                self.latencies = defaultdict(list)
+                self.errors = defaultdict(int)
+
+            async def call(self, client: httpx.AsyncClient, label: str, method: str, url: str, **kw):
+                t0 = time.perf_counter()
+                try:
+                    r = await client.request(method, url, **kw)
+                    ok = r.status_code < 400
+                except httpx.HTTPError:
+                    r, ok = None, False
+                self.latencies[label].append((time.perf_counter() - t0) * 1000)
+                if not ok:
+                    self.errors[label] += 1
+                return r if ok else None
+
+
+        async def browse_rfh(c, rec, ctx):
+            r = await rec.call(c, "GET /rfh", "GET", "/rfh")
+            items = r.json() if r is not None else []
+            if items:
+                await rec.call(c, "GET /rfh/{id}", "GET", f"/rfh/{random.choice(items)['id']}")
+
+
+        async def search_rfh(c, rec, ctx):
+            await rec.call(c, "GET /rfh?tag", "GET", "/rfh", params={"tag": random.choice(TAGS)})
+
+
+        async def browse_content(c, rec, ctx):
+            r = await rec.call(c, "GET /content", "GET", "/content")
+            items = r.json() if r is not None else []
+            if items:
+                await rec.call(c, "GET /content/{id}", "GET", f"/content/{random.choice(items)['id']}")
+
+
+        async def browse_questions(c, rec, ctx):
+            await rec.call(c, "GET /qa/questions", "GET", "/qa/questions")
+            if ctx["questions"]:
+                await rec.call(c, "GET /qa/questions/{id}/answers", "GET", f"/qa/questions/{random.choice(ctx['questions'])}/answers")
+
+
+        async def create_rfh(c, rec, ctx):
+            payload = {"title": sentence(6), "body": sentence(40), "tags": random.sample(TAGS, 2), "anonymous": random.random() < 0.2}
+            r = await rec.call(c, "POST /rfh", "POST", "/rfh", json=payload)
+            if r is not None:
+                ctx["rfh"].append(r.json()["id"])
+
+
+        async def match(c, rec, ctx):
+            if ctx["rfh"]:
+                await rec.call(c, "GET /match/{id}", "GET", f"/match/{random.choice(ctx['rfh'])}")
+
+
+        async def notifications(c, rec, ctx):
+            await rec.call(c, "GET /notifications", "GET", "/notifications")
+
+
+        SCENARIOS = {
+            "browse_rfh": (30, browse_rfh),
+            "search_rfh": (10, search_rfh),
+            "browse_content": (20, browse_content),
+            "browse_questions": (10, browse_questions),
+            "create_rfh": (5, create_rfh),
+            "match": (10, match),
+            "notifications": (15, notifications),
+        }
+
+
+        def parse_mix(spec: str | None) -> dict[str, int]:
+            mix = {name: weight for name, (weight, _) in SCENARIOS.items()}
+            for part in filter(None, (spec or "").split(",")):
+                name, _, weight = part.partition("=")
+                if name not in SCENARIOS:
+                    raise SystemExit(f"unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+                mix[name] = int(weight)
+            return {k: v for k, v in mix.items() if v > 0}
+
+
+        def percentile(sorted_ms: list[float], p: float) -> float:
+            if not sorted_ms:
+                return 0.0
+            return sorted_ms[min(len(sorted_ms) - 1, int(round(p / 100 * (len(sorted_ms) - 1))))]
+
+
+        def summarize(rec: Recorder, elapsed: float) -> dict:
+            endpoints = {}
+            for label, values in sorted(rec.latencies.items()):
+                values.sort()
+                n = len(values)
+                endpoints[label] = {
+                    "count": n,
+                    "rps": round(n / elapsed, 2),
+                    "errors": rec.errors[label],
+                    "error_rate": round(rec.errors[label] / n, 4),
+                    "p50_ms": round(percentile(values, 50), 2),
+                    "p95_ms": round(percentile(values, 95), 2),
+                    "p99_ms": round(percentile(values, 99), 2),
+                    "mean_ms": round(sum(values) / n, 2),
+                    "max_ms": round(values[-1], 2),
+                }
+            total = sum(e["count"] for e in endpoints.values())
+            errors = sum(e["errors"] for e in endpoints.values())
+            return {"requests": total, "rps": round(total / elapsed, 2), "errors": errors,
+                    "error_rate": round(errors / total, 4) if total else 0.0, "endpoints": endpoints}
+
+
+        def git_commit() -> str | None:
+            try:
+                return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+            except Exception:
+                return None
+
+
+        def print_report(summary: dict, baseline: dict | None = None):
+            print(f"{'endpoint':<34}{'count':>8}{'rps':>9}{'err%':>7}{'p50':>9}{'p95':>9}{'p99':>9}")
+            for label, e in summary["endpoints"].items():
+                line = (f"{label:<34}{e['count']:>8}{e['rps']:>9.1f}{e['error_rate'] * 100:>7.2f}"
+                        f"{e['p50_ms']:>9.1f}{e['p95_ms']:>9.1f}{e['p99_ms']:>9.1f}")
+                old = (baseline or {}).get("endpoints", {}).get(label)
+                if old and old["p95_ms"]:
+                    line += f"   p95 {(e['p95_ms'] / old['p95_ms'] - 1) * 100:+.1f}%"
+                print(line)
+            print(f"total {summary['requests']} requests, {summary['rps']:.1f} req/s, error rate {summary['error_rate'] * 100:.2f}%")
+
+
+        async def virtual_user(client, rec, ctx, names, weights, deadline, think):
+            while time.perf_counter() < deadline:
+                name = random.choices(names, weights)[0]
+                await SCENARIOS[name][1](client, rec, ctx)
+                if think:
+                    await asyncio.sleep(random.uniform(0, think))
+
+
+        async def main():
+            ap = argparse.ArgumentParser()
+            ap.add_argument("--base-url", default="http://127.0.0.1:8000/api")
+            ap.add_argument("--duration", type=float, default=30.0)
+            ap.add_argument("--concurrency", type=int, default=20)
+            ap.add_argument("--mix", help="overrides, e.g. browse_rfh=40,create_rfh=0")
+            ap.add_argument("--think", type=float, default=0.0, help="max random pause between scenarios (s)")
+            ap.add_argument("--out", help="write JSON results here")
+            ap.add_argument("--compare", help="previous JSON result to diff p95 against")
+            args = ap.parse_args()
+
+            mix = parse_mix(args.mix)
+            seed = orjson.loads(SEED_PATH.read_bytes()) if SEED_PATH.exists() else {"users": [], "rfh": [], "questions": []}
+            if not seed["users"]:
+                raise SystemExit(f"no seeded users in {SEED_PATH}; run python -m loadtest.seed first")
+            ctx = {"rfh": list(seed["rfh"]), "questions": list(seed["questions"])}
+            tokens = {u: mint(u, ttl=int(args.duration) + 600) for u in random.sample(seed["users"], min(len(seed["users"]), args.concurrency))}
+            names, weights = list(mix), list(mix.values())
+
+            rec = Recorder()
+            limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+            clients = [httpx.AsyncClient(base_url=args.base_url, headers={"Authorization": f"Bearer {tokens[u]}"}, limits=limits, timeout=30.0)
+                       for u in random.choices(list(tokens), k=args.concurrency)]
+            started = datetime.now(timezone.utc)
+            t0 = time.perf_counter()
+            deadline = t0 + args.duration
+            try:
+                await asyncio.gather(*(virtual_user(c, rec, ctx, names, weights, deadline, args.think) for c in clients))
+            finally:
+                await asyncio.gather(*(c.aclose() for c in clients))
+            summary = summarize(rec, time.perf_counter() - t0)
+
+            baseline = orjson.loads(open(args.compare, "rb").read())["summary"] if args.compare else None
+            print_report(summary, baseline)
+            if args.out:
+                result = {
+                    "meta": {"commit": git_commit(), "started_at": started.isoformat(), "base_url": args.base_url,
+                             "duration_s": args.duration, "concurrency": args.concurrency, "mix": mix},
+                    "summary": summary,
+                }
+                with open(args.out, "wb") as f:
+                    f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+
+
+        if __name__ == "__main__":
+            asyncio.run(main())
+    """)
+
     write(ROOT / "docker/Dockerfile", """
         FROM python:3.11-slim
         ENV PYTHONDONTWRITEBYTECODE=1 PYTHONUNBUFFERED=1
@@ -386,8 +2181,9 @@ def main():
         COPY requirements.txt .
         RUN pip install --no-cache-dir -r requirements.txt
         COPY app ./app
+        COPY gunicorn.conf.py .
         EXPOSE 8000
-        CMD ["uvicorn", "app.main:app", "--host", "0.0.0.0", "--port", "8000"]
+        CMD ["gunicorn", "-c", "gunicorn.conf.py", "app.main:app"]
     """, skip_if_exists=True)
 
     write(ROOT / "docker/docker-compose.yml", """
@@ -50,6 +50,7 @@ begin
     create type role_kind as enum ('user','editor','moderator','admin','mentor','mentee','investor','founder');
   end if;
 end$$;
+alter type rfh_status add value if not exists 'hidden'; -- set by moderation (auto-hide)
 
 -- ---------- Profiles (linked to auth.users) ----------
 create table if not exists public.profiles (
@@ -74,6 +75,21 @@ create table if not exists public.profiles (
 create trigger trg_profiles_updated
 before update on public.profiles
 for each row execute procedure public.set_timestamp();
+-- keyset for the per-worker profile indexes (text similarity, project candidates)
+create index if not exists idx_profiles_updated on public.profiles(updated_at, id);
+
+-- Helper filters in match_helpers. The timezone filter matches zone names (their current
+-- offsets are computed in the API, so DST never leaves a stored offset stale); earlier
+-- versions of this schema kept a utc_offset column, dropped here.
+drop trigger if exists trg_profiles_utc_offset on public.profiles;
+drop function if exists public.profiles_utc_offset();
+alter table public.profiles drop column if exists utc_offset;
+create index if not exists idx_profiles_timezone on public.profiles(timezone);
+create index if not exists idx_profiles_languages on public.profiles using gin (languages);
+create index if not exists idx_profiles_region on public.profiles(region);
+create index if not exists idx_profiles_country on public.profiles(country);
+-- match_helpers candidates: helpers offering any of the RFH's tags (offers && :tags)
+create index if not exists idx_profiles_offers on public.profiles using gin (offers);
 
 -- Auto-create profile on new user
 create or replace function public.handle_new_user()
@@ -157,9 +173,13 @@ create table if not exists public.questions (
   visibility visibility default 'public',
   accepted_answer_id uuid,
   tsv tsvector,
+  answer_count int not null default 0,  -- maintained by trg_answers_counts
+  last_answer_at timestamptz,
   created_at timestamptz default now(),
   updated_at timestamptz default now()
 );
+alter table public.questions add column if not exists answer_count int not null default 0;
+alter table public.questions add column if not exists last_answer_at timestamptz;
 create index if not exists idx_questions_tsv on public.questions using gin(tsv);
 create or replace function public.questions_tsv_update()
 returns trigger language plpgsql as $$
@@ -170,7 +190,7 @@ begin
 end$$;
 drop trigger if exists trg_questions_tsv on public.questions;
 create trigger trg_questions_tsv
-before insert or update on public.questions
+before insert or update of title, body on public.questions
 for each row execute procedure public.questions_tsv_update();
 
 create trigger trg_questions_updated
@@ -189,10 +209,36 @@ create table if not exists public.answers (
   updated_at timestamptz default now()
 );
 create index if not exists idx_answers_q on public.answers(question_id);
+-- keyset pagination of a thread: (created_at, id) after the cursor answer
+create index if not exists idx_answers_q_created on public.answers(question_id, created_at, id);
 create trigger trg_answers_updated
 before update on public.answers
 for each row execute procedure public.set_timestamp();
 
+-- per-question answer counters, so thread metrics don't count large threads on every read
+create or replace function public.answers_counts()
+returns trigger language plpgsql as $$
+begin
+  if tg_op = 'INSERT' then
+    update public.questions
+       set answer_count = answer_count + 1, last_answer_at = greatest(last_answer_at, new.created_at)
+     where id = new.question_id;
+  else
+    update public.questions set answer_count = greatest(answer_count - 1, 0) where id = old.question_id;
+  end if;
+  return null;
+end$$;
+drop trigger if exists trg_answers_counts on public.answers;
+create trigger trg_answers_counts
+after insert or delete on public.answers
+for each row execute procedure public.answers_counts();
+
+-- backfill (no-op on a fresh database)
+update public.questions q
+   set answer_count = s.n, last_answer_at = s.last_at
+  from (select question_id, count(*) as n, max(created_at) as last_at from public.answers group by question_id) s
+ where s.question_id = q.id and q.answer_count is distinct from s.n;
+
 -- link accepted answer
 create or replace function public.accept_answer(p_question uuid, p_answer uuid, p_actor uuid)
 returns void language plpgsql as $$
@@ -293,9 +339,13 @@ create table if not exists public.project_applications (
   project_id uuid references public.projects(id) on delete cascade,
   applicant_id uuid references public.profiles(id) on delete cascade,
   message text,
-  status text default 'pending', -- pending/accepted/rejected
+  status text default 'pending', -- pending/proposed/accepted/rejected
+  proposed_role text, -- needed role picked by the team-formation optimizer, pending owner approval
   created_at timestamptz default now()
 );
+alter table public.project_applications add column if not exists proposed_role text;
+create index if not exists idx_project_apps_open
+  on public.project_applications(project_id) where status in ('pending', 'proposed');
 
 -- ---------- Events (courses/webinars/workshops) ----------
 create table if not exists public.events (
@@ -308,6 +358,7 @@ create table if not exists public.events (
   ends_at timestamptz,
   location text, -- url or venue
   capacity int,
+  enrolled_count int not null default 0, -- 'going' enrollments, maintained by enroll_event/cancel_enrollment
   tags text[] default array[]::text[],
   visibility visibility default 'public',
   created_at timestamptz default now(),
@@ -316,6 +367,8 @@ create table if not exists public.events (
 create trigger trg_events_updated
 before update on public.events
 for each row execute procedure public.set_timestamp();
+-- upcoming/calendar range scans
+create index if not exists idx_events_public_starts on public.events(starts_at) where visibility = 'public';
 
 create table if not exists public.event_enrollments (
   event_id uuid references public.events(id) on delete cascade,
@@ -324,6 +377,64 @@ create table if not exists public.event_enrollments (
   created_at timestamptz default now(),
   primary key (event_id, user_id)
 );
+alter table public.events add column if not exists enrolled_count int not null default 0;
+create index if not exists idx_event_enrollments_waitlist
+  on public.event_enrollments(event_id, created_at) where status = 'waitlist';
+
+-- Capacity: every enroll/cancel of an event locks that event's row, then decides from
+-- enrolled_count (no count(*) over enrollments), so concurrent enrollments never overbook.
+create or replace function public.enroll_event(p_event uuid, p_user uuid)
+returns text language plpgsql as $$
+declare cap int; cnt int; st text;
+begin
+  select capacity, enrolled_count into cap, cnt from public.events where id = p_event for update;
+  if not found then
+    return null;
+  end if;
+  select status into st from public.event_enrollments where event_id = p_event and user_id = p_user;
+  if st in ('going', 'waitlist') then
+    return st;
+  end if;
+  st := case when cap is null or cnt < cap then 'going' else 'waitlist' end;
+  insert into public.event_enrollments (event_id, user_id, status) values (p_event, p_user, st)
+  on conflict (event_id, user_id) do update set status = excluded.status, created_at = now();
+  if st = 'going' then
+    update public.events set enrolled_count = enrolled_count + 1 where id = p_event;
+  end if;
+  return st;
+end$$;
+
+-- Returns the previous status (null if not enrolled). A freed seat goes to the oldest waitlisted user.
+create or replace function public.cancel_enrollment(p_event uuid, p_user uuid)
+returns text language plpgsql as $$
+declare prev text; promoted uuid;
+begin
+  perform 1 from public.events where id = p_event for update;
+  select status into prev from public.event_enrollments where event_id = p_event and user_id = p_user;
+  if prev is distinct from 'going' and prev is distinct from 'waitlist' then
+    return null;
+  end if;
+  update public.event_enrollments set status = 'cancelled' where event_id = p_event and user_id = p_user;
+  if prev = 'going' then
+    update public.event_enrollments set status = 'going'
+     where (event_id, user_id) = (select event_id, user_id from public.event_enrollments
+                                   where event_id = p_event and status = 'waitlist'
+                                   order by created_at, user_id limit 1)
+    returning user_id into promoted;
+    if promoted is null then
+      update public.events set enrolled_count = greatest(enrolled_count - 1, 0) where id = p_event;
+    else
+      insert into public.notifications (user_id, type, payload)
+      values (promoted, 'event_waitlist_promoted', jsonb_build_object('event_id', p_event));
+    end if;
+  end if;
+  return prev;
+end$$;
+
+-- backfill (no-op on a fresh database)
+update public.events ev set enrolled_count = s.n
+  from (select event_id, count(*) as n from public.event_enrollments where status = 'going' group by event_id) s
+ where s.event_id = ev.id and ev.enrolled_count is distinct from s.n;
 
 -- ---------- Discussions / Forums ----------
 create table if not exists public.discussion_topics (
@@ -393,6 +504,111 @@ create table if not exists public.reports (
 create trigger trg_reports_updated
 before update on public.reports
 for each row execute procedure public.set_timestamp();
+create index if not exists idx_reports_entity on public.reports(entity, entity_id);
+-- severity drives queue priority and auto-hide, so it is bounded to 1-5; rows written
+-- before the check are clamped first
+update public.reports set severity = least(greatest(severity, 1), 5) where severity not between 1 and 5;
+do $$
+begin
+  alter table public.reports add constraint reports_severity_range check (severity between 1 and 5);
+exception when duplicate_object then null;
+end$$;
+
+-- Moderation queue: one row per reported entity, kept current by a trigger on reports
+-- (any insert path, including direct client inserts). Counts and max_severity cover
+-- reports that are not closed; the API auto-hides an entity when they cross the
+-- REPORT_AUTOHIDE_* thresholds and stamps hidden_at in the same transaction.
+create table if not exists public.report_queue (
+  entity entity_kind not null,
+  entity_id uuid not null,
+  open_count int not null default 0,
+  total_count int not null default 0,
+  max_severity int not null default 0,
+  first_reported_at timestamptz,
+  last_reported_at timestamptz,
+  hidden_at timestamptz,
+  priority int generated always as (max_severity * 100 + least(open_count, 99)) stored,
+  primary key (entity, entity_id)
+);
+-- what hiding replaced (rfh.status, or content.is_published as text), restored on dismiss
+alter table public.report_queue add column if not exists hidden_from text;
+create index if not exists idx_report_queue_priority
+  on public.report_queue(priority desc, last_reported_at desc) where open_count > 0;
+
+create or replace function public.report_queue_apply()
+returns trigger language plpgsql security definer set search_path = public as $$
+begin
+  if tg_op = 'INSERT' then
+    insert into public.report_queue as q (entity, entity_id, open_count, total_count, max_severity, first_reported_at, last_reported_at)
+    values (new.entity, new.entity_id, 1, 1, coalesce(new.severity, 1), new.created_at, new.created_at)
+    on conflict (entity, entity_id) do update set
+      open_count = q.open_count + 1,
+      total_count = q.total_count + 1,
+      max_severity = greatest(q.max_severity, excluded.max_severity),
+      last_reported_at = greatest(q.last_reported_at, excluded.last_reported_at);
+  elsif (old.state = 'closed') is distinct from (new.state = 'closed') then
+    -- closed or reopened: recount this entity's open reports (idx_reports_entity)
+    update public.report_queue q set (open_count, max_severity) = (
+      select count(*), coalesce(max(r.severity), 0) from public.reports r
+      where r.entity = new.entity and r.entity_id = new.entity_id and r.state <> 'closed')
+    where q.entity = new.entity and q.entity_id = new.entity_id;
+  end if;
+  return null;
+end$$;
+drop trigger if exists trg_reports_queue on public.reports;
+create trigger trg_reports_queue
+after insert or update of state on public.reports
+for each row execute procedure public.report_queue_apply();
+
+-- backfill (no-op on a fresh database)
+insert into public.report_queue (entity, entity_id, open_count, total_count, max_severity, first_reported_at, last_reported_at)
+select entity, entity_id, count(*) filter (where state <> 'closed'), count(*),
+       coalesce(max(severity) filter (where state <> 'closed'), 0), min(created_at), max(created_at)
+from public.reports group by entity, entity_id
+on conflict do nothing;
+update public.report_queue set max_severity = 5 where max_severity > 5; -- severities clamped above
+
+-- ---------- Background jobs (app/jobs) ----------
+-- Done jobs are deleted; failed ones stay with last_error until handled by hand.
+create table if not exists public.jobs (
+  id bigint generated always as identity primary key,
+  queue text not null,
+  kind text not null,
+  payload jsonb not null default '{}',
+  state text not null default 'queued', -- queued/running/failed
+  attempts int not null default 0,
+  max_attempts int not null default 5,
+  run_at timestamptz not null default now(),
+  locked_at timestamptz,
+  locked_by text,
+  last_error text,
+  created_at timestamptz not null default now()
+);
+create index if not exists idx_jobs_ready on public.jobs(queue, run_at, id) where state = 'queued';
+create index if not exists idx_jobs_running on public.jobs(locked_at) where state = 'running';
+
+-- ---------- Rate limits (shared limiter state, RATE_LIMIT_BACKEND=postgres) ----------
+-- tat = theoretical arrival time of the bucket (GCRA); unlogged: losing it on crash only resets limits
+create unlogged table if not exists public.rate_limits (
+  key text primary key,
+  tat timestamptz not null
+);
+create index if not exists idx_rate_limits_tat on public.rate_limits(tat);
+
+-- ---------- Idempotency keys (Idempotency-Key header on create endpoints) ----------
+-- status/response are null while the first request is in flight (its transaction holds the row)
+create table if not exists public.idempotency_keys (
+  user_id uuid not null,
+  key text not null,
+  scope text not null,
+  request_hash text not null,
+  status smallint,
+  response jsonb,
+  created_at timestamptz not null default now(),
+  expires_at timestamptz not null,
+  primary key (user_id, key)
+);
+create index if not exists idx_idempotency_keys_expires on public.idempotency_keys(expires_at);
 
 -- ---------- Reputation / Badges ----------
 create table if not exists public.badges (
@@ -462,8 +678,12 @@ alter table public.forum_posts enable row level security;
 alter table public.comments enable row level security;
 alter table public.notifications enable row level security;
 alter table public.reports enable row level security;
+alter table public.report_queue enable row level security; -- server only, no policies
 alter table public.badges enable row level security;
 alter table public.user_badges enable row level security;
+alter table public.rate_limits enable row level security; -- server only, no policies
+alter table public.jobs enable row level security; -- server only, no policies
+alter table public.idempotency_keys enable row level security; -- server only, no policies
 
 -- Profiles
 create policy "profiles_select_public" on public.profiles